@@ -1,4 +1,7 @@
+import sys
+
 from src.handlers import mom_handler
+from src.helper.Misc.options_game import Options
 
 
 class MasterOfMonsters:
@@ -8,5 +11,12 @@ class MasterOfMonsters:
 
 
 print("Starting")
+if '--frame-stats' in sys.argv:
+    Options.frame_stats = True
+if '--fast-forward' in sys.argv:
+    Options.fast_forward_ticks = 8
+    Options.skip_ai_animations = True
+if '--threaded-ai' in sys.argv:
+    Options.threaded_ai = True
 MasterOfMonsters()
 print("Bye")
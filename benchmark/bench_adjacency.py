@@ -0,0 +1,101 @@
+"""Compares FullMatrixProcessor fills with and without the adjacency table
+
+Run from the repository root with: python -m benchmark.bench_adjacency
+"""
+import random
+import timeit
+
+from src.components.board.board import AdjacencyTable, RandomBoardBuilder, \
+    MapOptions
+from src.components.board.pathing import PathMatrixFactory
+from src.helper.Misc.constants import Terrain
+from src.helper.Misc.datatables import DataTables
+
+BOARD_SIZE = 100
+REPEATS = 5
+
+
+def get_monster_for_every_movement_type():
+    DataTables.ensure_loaded()
+    monsters = {}
+    for stats in DataTables.monster_stats[1:]:
+        if stats.terrain_type not in monsters:
+            monsters[stats.terrain_type] = stats.id
+    return tuple(monsters.values())
+
+
+def make_board():
+    random.seed(0)
+    mapoptions = MapOptions()
+    mapoptions.mapname = 'random'
+    board = RandomBoardBuilder().load_map(BOARD_SIZE, BOARD_SIZE, mapoptions)
+    return board
+
+
+def fill_matrices(board, starts):
+    # a new factory every time, so matrices don't come from its cache
+    factory = PathMatrixFactory(board)
+    for start in starts:
+        factory.generate_path_matrix(start)
+
+
+def place_monsters(board):
+    starts = []
+    player = board.get_current_player()
+    monsters = get_monster_for_every_movement_type()
+    for n, monster_type in enumerate(monsters):
+        pos = (5 + n * 7, 50)
+        board.set_terrain_to(pos, Terrain.GRASS)
+        board.place_new_monster(monster_type, pos, player)
+        starts.append(pos)
+    return starts
+
+
+def compute_uncached(board):
+    def get_posses_adjacent_to(pos):
+        return AdjacencyTable.compute_posses_adjacent_to(
+            pos, board.x_max, board.y_max)
+    return get_posses_adjacent_to
+
+
+def lookup_all(board):
+    for x in range(board.x_max):
+        for y in range(board.y_max):
+            board.get_posses_adjacent_to((x, y))
+
+
+def time_cached_and_uncached(board, callback, number):
+    cached = min(timeit.repeat(callback, number=number, repeat=REPEATS))
+    board.get_posses_adjacent_to = compute_uncached(board)
+    uncached = min(timeit.repeat(callback, number=number, repeat=REPEATS))
+    del board.get_posses_adjacent_to
+    return cached, uncached
+
+
+def report(title, cached, uncached):
+    print(title)
+    print(f'  computed on the fly: {uncached * 1000:8.1f} ms')
+    print(f'  adjacency table:     {cached * 1000:8.1f} ms')
+    print(f'  speedup:             {uncached / cached:8.2f}x')
+
+
+def run():
+    board = make_board()
+    starts = place_monsters(board)
+
+    def fill():
+        fill_matrices(board, starts)
+
+    def lookup():
+        lookup_all(board)
+
+    cached, uncached = time_cached_and_uncached(board, lookup, 10)
+    report(f'10 lookups of every pos on {BOARD_SIZE}x{BOARD_SIZE}',
+           cached, uncached)
+    cached, uncached = time_cached_and_uncached(board, fill, 50)
+    report(f'50 full matrix fills for {len(starts)} movement types',
+           cached, uncached)
+
+
+if __name__ == '__main__':
+    run()
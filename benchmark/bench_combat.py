@@ -0,0 +1,52 @@
+"""Compares playing fights one combat log at a time and in a batch
+
+Run from the repository root with: python -m benchmark.bench_combat
+"""
+import random
+import timeit
+
+from src.components.board.monster import Monster
+from src.components.board.players import Player
+from src.components.combat.batchcombat import BatchCombatBuilder
+from src.components.combat.combatlogbuilder import CombatLogBuilder
+from src.helper.Misc.constants import Terrain, Range, DayTime
+from src.helper.Misc.datatables import DataTables
+
+FIGHTS_PER_PAIR = 20
+REPEATS = 3
+
+
+def make_monster_pairs():
+    DataTables.ensure_loaded()
+    players = (Player(0), Player(1))
+    monsters = [[Monster(stats.id, (0, 0), player, Terrain.GRASS)
+                 for stats in DataTables.monster_stats[1:]]
+                for player in players]
+    return [pair for pair in zip(*monsters)] * FIGHTS_PER_PAIR
+
+
+def play_logs(pairs):
+    builder = CombatLogBuilder(random.Random(0))
+    for monsters in pairs:
+        builder.build_from_monsters(monsters, Range.CLOSE, DayTime.DAY)
+
+
+def play_batch(pairs):
+    builder = BatchCombatBuilder(random.Random(0))
+    builder.build_from_monsters(pairs, Range.CLOSE, DayTime.DAY)
+
+
+def run():
+    pairs = make_monster_pairs()
+    logs = min(timeit.repeat(lambda: play_logs(pairs), number=1,
+                             repeat=REPEATS))
+    batch = min(timeit.repeat(lambda: play_batch(pairs), number=1,
+                              repeat=REPEATS))
+    print(f'{len(pairs)} close range fights')
+    print(f'  combat logs: {logs * 1000:8.1f} ms')
+    print(f'  batch:       {batch * 1000:8.1f} ms')
+    print(f'  speedup:     {logs / batch:8.2f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+"""Compares the data table getters with and without the lazy load checks
+
+The getters used to load the tables on first use, so every call checked if
+they were loaded. The checking versions are put back here to compare.
+
+Run from the repository root with: python -m benchmark.bench_datatables
+"""
+import timeit
+
+from src.components.board.monster import Monster
+from src.components.board.players import Player
+from src.components.combat.attack import AttackFactory
+from src.helper.Misc.constants import Terrain, AttackType
+from src.helper.Misc.datatables import DataTables
+
+NUMBER = 200_000
+REPEATS = 5
+
+
+def get_terrain_cost(terrain, movement_type):
+    if not DataTables.loaded:
+        DataTables.load()
+    assert terrain is not None
+    assert movement_type is not None
+    return DataTables.terrain_cost[terrain][movement_type]
+
+
+def get_terrain_defense(terrain, terrain_type):
+    if not DataTables.loaded:
+        DataTables.load()
+    return DataTables.terrain_defense[terrain][terrain_type]
+
+
+def get_monster_stats(monster_id):
+    if not DataTables.loaded:
+        DataTables.load()
+    return DataTables.monster_stats[monster_id]
+
+
+checking_getters = {'get_terrain_cost': get_terrain_cost,
+                    'get_terrain_defense': get_terrain_defense,
+                    'get_monster_stats': get_monster_stats}
+
+
+def time_direct_and_checking(callback, number):
+    direct = min(timeit.repeat(callback, number=number, repeat=REPEATS))
+    getters = {name: vars(DataTables)[name] for name in checking_getters}
+    for name, getter in checking_getters.items():
+        setattr(DataTables, name, staticmethod(getter))
+    checking = min(timeit.repeat(callback, number=number, repeat=REPEATS))
+    for name, getter in getters.items():
+        setattr(DataTables, name, getter)
+    return direct, checking
+
+
+def report(title, direct, checking):
+    print(title)
+    print(f'  checking if loaded: {checking * 1000:8.1f} ms')
+    print(f'  direct lookup:      {direct * 1000:8.1f} ms')
+    print(f'  speedup:            {checking / direct:8.2f}x')
+
+
+def run():
+    DataTables.ensure_loaded()
+    monsters = (Monster(Monster.Type.ROMAN, (0, 0), Player(0), Terrain.GRASS),
+                Monster(Monster.Type.TROLL, (0, 1), Player(1), Terrain.FOREST))
+
+    def look_up():
+        DataTables.get_terrain_cost(Terrain.FOREST, 3)
+        DataTables.get_terrain_defense(Terrain.FOREST, 3)
+        DataTables.get_monster_stats(Monster.Type.ROMAN)
+
+    factory = AttackFactory()
+
+    def get_accuracies():
+        # every attack made for a monster not in the attack tables yet
+        for defender in monsters:
+            factory._get_accuracy(defender, AttackType.PHYSICAL)
+            factory._get_accuracy(defender, AttackType.HEAT)
+
+    direct, checking = time_direct_and_checking(look_up, NUMBER)
+    report(f'{NUMBER} lookups in each of three tables', direct, checking)
+    direct, checking = time_direct_and_checking(get_accuracies, NUMBER // 4)
+    report(f'{NUMBER} accuracies of attacks on a monster', direct, checking)
+
+
+if __name__ == '__main__':
+    run()
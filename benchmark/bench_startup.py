@@ -0,0 +1,34 @@
+"""Compares loading the data tables from the csv files and from the cache
+
+Run from the repository root with: python -m benchmark.bench_startup
+"""
+import timeit
+
+from src.helper.Misc.datatables import DataTables, TableCache, TableLoader
+
+NUMBER = 20
+REPEATS = 5
+
+
+def parse():
+    DataTables._clear()
+    TableLoader(DataTables).load_tables()
+
+
+def load_cache():
+    DataTables._clear()
+    assert TableCache(DataTables).load_tables()
+
+
+def run():
+    DataTables.load()  # makes sure the cache is there
+    cold = min(timeit.repeat(parse, number=NUMBER, repeat=REPEATS))
+    warm = min(timeit.repeat(load_cache, number=NUMBER, repeat=REPEATS))
+    print(f'{NUMBER} loads of the data tables')
+    print(f'  parsing csv files: {cold * 1000:8.1f} ms')
+    print(f'  table cache:       {warm * 1000:8.1f} ms')
+    print(f'  speedup:           {cold / warm:8.2f}x')
+
+
+if __name__ == '__main__':
+    run()
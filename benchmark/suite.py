@@ -0,0 +1,283 @@
+"""Times the hot paths on fixed boards and compares them with a baseline
+
+Every case uses fixed seeds, so later runs time the same work. The first
+run, or a run with --save, writes the times to the baseline file, later runs
+compare with it and exit with an error when a case got slower than the
+tolerance allows.
+
+Run from the repository root with: python -m benchmark.suite [--save]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+from benchmark.bench_adjacency import get_monster_for_every_movement_type
+from src.components.board.board import RandomBoardBuilder, MapOptions, \
+    BoardTextBuilder
+from src.components.board.monster import Monster
+from src.components.board.pathing import PathMatrixFactory
+from src.components.board.pathing_components import AStarMatrixFactory, \
+    TowerSearchMatrixFactory
+from src.components.combat.batchcombat import BatchCombatBuilder
+from src.components.combat.combatlogbuilder import CombatLogBuilder
+from src.controller.headless_controller import HeadlessBoardController
+from src.helper.Misc.constants import ROOT, Terrain, Range, DayTime, AiType
+from src.helper.Misc.datatables import DataTables
+from src.model.board_model import BoardModel
+
+BASELINE_LOCATION = f'{ROOT}benchmark/baseline.json'
+SIZES = (20, 64, 256)
+SEED = 0
+REPEATS = 5
+TOLERANCE = 1.25
+BRAIN_MONSTERS = 20
+FIGHTS = 1000
+
+
+class Case:
+    """Something to time, make returns the callable to time
+
+    Reusable callables are called as often as fits in 0.2 seconds per
+    repeat, to smooth out noise. Others change what they work on, so make
+    is called again for every repeat and the callable is called once.
+    """
+
+    def __init__(self, name, make, reusable=True):
+        self.name = name
+        self.make = make
+        self.reusable = reusable
+
+    def time(self):
+        """Returns the fastest time of one call, in seconds"""
+        if not self.reusable:
+            return min(timeit.timeit(self.make(), number=1)
+                       for _ in range(REPEATS))
+        timer = timeit.Timer(self.make())
+        number, _ = timer.autorange()
+        return min(timer.repeat(REPEATS, number)) / number
+
+
+def make_random_board(size):
+    mapoptions = MapOptions()
+    mapoptions.mapname = 'random'
+    return RandomBoardBuilder(random.Random(SEED)).load_map(
+        size, size, mapoptions)
+
+
+def make_sparse_tower_board(size):
+    """Grass with two towers, both far from the top left corner"""
+    towers = {(size - 2, size - 2), (size - 2, size // 2)}
+    rows = [' '.join('T' if (x, y) in towers else '.' for x in range(size))
+            for y in range(size)]
+    text = f'{size} {size}\n' + '\n'.join(rows)
+    legend = {'.': Terrain.GRASS, 'T': Terrain.TOWER}
+    return BoardTextBuilder().make_board_from_text(text, legend)
+
+
+def place_monster_on_grass(board, monster_type, pos, owner=None):
+    board.set_terrain_to(pos, Terrain.GRASS)
+    return board.place_new_monster(monster_type, pos, owner)
+
+
+def get_full_fill_case(size):
+    def make():
+        board = make_random_board(size)
+        starts = []
+        for n, monster_type in enumerate(
+                get_monster_for_every_movement_type()):
+            pos = (n % (size - 2) + 1, size // 2 + n // (size - 2))
+            place_monster_on_grass(board, monster_type, pos)
+            starts.append(pos)
+
+        def fill():
+            # a new factory every time, so matrices don't come from its cache
+            factory = PathMatrixFactory(board)
+            for start in starts:
+                factory.generate_path_matrix(start)
+        return fill
+    return Case(f'full fills, random {size}', make)
+
+
+def get_a_star_case(size):
+    def make():
+        board = make_random_board(size)
+        start, destination = (0, 0), (size - 1, size - 1)
+        place_monster_on_grass(board, Monster.Type.ROMAN, start)
+        board.set_terrain_to(destination, Terrain.GRASS)
+        return lambda: AStarMatrixFactory(board).generate_path_matrix(
+            start, destination)
+    return Case(f'a star diagonal, random {size}', make)
+
+
+def get_tower_search_case(size):
+    def make():
+        board = make_sparse_tower_board(size)
+        start = (1, 1)
+        place_monster_on_grass(board, Monster.Type.ROMAN, start)
+        return lambda: TowerSearchMatrixFactory(board).generate_path_matrix(
+            start)
+    return Case(f'tower search, sparse text {size}', make)
+
+
+def get_distance_to(pos):
+    return lambda other: (abs(other[0] - pos[0]) + abs(other[1] - pos[1]),
+                          other)
+
+
+def make_brain_turn(size):
+    """A turn on random terrain
+
+    Random boards have no lords, which the brain needs, so the model is made
+    on a generated map of the same size for its lords, and its terrain is
+    replaced with that of a random board. Loading terrain leaves the towers
+    without owner, so every player captures as many towers as it had, the
+    ones closest to its lord.
+    """
+    mapoptions = MapOptions()
+    mapoptions.mapname = 'generated'
+    mapoptions.map_size = (size, size)
+    mapoptions.seed = SEED
+    mapoptions.set_number_of_players(2)
+    mapoptions.ai_types = {0: AiType.default, 1: AiType.idle}
+    model = BoardModel(mapoptions)
+    controller = HeadlessBoardController(model)
+    player = model.get_current_player()
+    board = model.board
+    board.load_terrain(make_random_board(size).terrain)
+    for lord in board.lords:
+        board.set_terrain_to(lord.pos, Terrain.GRASS)
+    recapture_towers(board)
+    lord = board.get_lord_of(player)
+    monster_types = (Monster.Type.ROMAN, Monster.Type.TROLL,
+                     Monster.Type.GRIFFIN, Monster.Type.WARRIOR)
+    posses = sorted(((x, y) for x in range(board.x_max)
+                     for y in range(board.y_max)),
+                    key=get_distance_to(lord.pos))
+    free_posses = (pos for pos in posses if board.monster_at(pos) is None
+                   and board.terrain_at(pos) == Terrain.GRASS)
+    for n in range(BRAIN_MONSTERS - 1):
+        board.place_new_monster(
+            monster_types[n % len(monster_types)], next(free_posses), player)
+
+    def play_turn():
+        controller.append_ai_callback()
+        while model.get_current_player() is player:
+            controller.do_ai_action()
+    return play_turn
+
+
+def recapture_towers(board):
+    for player in board.players:
+        tower_count = player.tower_count
+        player.tower_count = 0
+        towers = sorted(
+            (pos for pos in board.towers if board.tower_owner_at(pos) is None),
+            key=get_distance_to(board.get_lord_of(player).pos))
+        for pos in towers[:tower_count]:
+            board.capture_terrain_at(pos, player)
+
+
+def get_brain_case(size):
+    """The turn of a default brain with BRAIN_MONSTERS monsters"""
+    return Case(f'default brain turn, random {size}',
+                lambda: make_brain_turn(size), reusable=False)
+
+
+def get_combat_cases():
+    def make_monsters():
+        board = make_random_board(SIZES[0])
+        return (
+            place_monster_on_grass(board, Monster.Type.ROMAN, (4, 4)),
+            place_monster_on_grass(board, Monster.Type.TROLL, (4, 5),
+                                   board.players[1]))
+
+    def make_logs():
+        monsters = make_monsters()
+        builder = CombatLogBuilder(random.Random(SEED))
+        return lambda: [builder.build_from_monsters(
+            monsters, Range.CLOSE, DayTime.DAY) for _ in range(FIGHTS)]
+
+    def make_batch():
+        monsters = make_monsters()
+        builder = BatchCombatBuilder(random.Random(SEED))
+        return lambda: builder.build_from_monsters(
+            [monsters] * FIGHTS, Range.CLOSE, DayTime.DAY)
+    return (Case(f'combat logs, {FIGHTS} fights', make_logs),
+            Case(f'batch combat, {FIGHTS} fights', make_batch))
+
+
+def get_cases():
+    """Cases make their boards when they are timed, not here"""
+    cases = []
+    for size in SIZES:
+        cases += (get_full_fill_case(size), get_a_star_case(size),
+                  get_tower_search_case(size), get_brain_case(size))
+    cases += get_combat_cases()
+    return cases
+
+
+def matches_filter(name, name_filter):
+    """Every word of the filter has to be a whole word of the name
+
+    So a filter of 20 matches the size 20 cases, but not size 256.
+    """
+    words = name.replace(',', ' ').split()
+    return all(word in words for word in name_filter.split())
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_LOCATION):
+        return {}
+    with open(BASELINE_LOCATION) as fd:
+        return json.load(fd)
+
+
+def save_baseline(times):
+    with open(BASELINE_LOCATION, 'w') as fd:
+        json.dump(times, fd, indent=1)
+
+
+def run(save=False, tolerance=TOLERANCE, name_filter=''):
+    """Returns the names of the cases that got slower than the baseline"""
+    DataTables.ensure_loaded()
+    baseline = load_baseline()
+    times = {}
+    regressions = []
+    for case in get_cases():
+        if not matches_filter(case.name, name_filter):
+            continue
+        times[case.name] = seconds = case.time()
+        line = f'{case.name:<50} {seconds * 1000:10.3f} ms'
+        if case.name in baseline:
+            ratio = seconds / baseline[case.name]
+            line += f'  {ratio:5.2f}x baseline'
+            if ratio > tolerance:
+                regressions.append(case.name)
+                line += '  SLOWER'
+        print(line)
+    if save or not baseline:
+        save_baseline({**baseline, **times})
+        print(f'baseline written to {BASELINE_LOCATION}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--save', action='store_true',
+                        help='write the times as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='slowest allowed time compared to the baseline')
+    parser.add_argument('--filter', default='',
+                        help='only run cases with all these words in their name')
+    arguments = parser.parse_args()
+    regressions = run(arguments.save, arguments.tolerance, arguments.filter)
+    if regressions:
+        print(f'{len(regressions)} case(s) slower than the baseline')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
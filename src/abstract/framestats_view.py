@@ -0,0 +1,37 @@
+import pygame
+
+from src.abstract.view import View
+from src.helper.Misc.constants import Color
+from src.helper.framestats import FrameStats
+
+
+class FrameStatsView(View):
+    """Overlay in the top left corner, showing the frame stats
+
+    The text changes only every REFRESH_FRAMES frames, so the overlay adds
+    little to the frames it measures. Its own redraw shows up in the counts
+    of those frames.
+    """
+    REFRESH_FRAMES = 30
+    WIDTH = 540
+    HEIGHT = 36
+
+    def __init__(self, frame_stats: FrameStats):
+        super().__init__(pygame.Rect(0, 0, self.WIDTH, self.HEIGHT))
+        self.frame_stats = frame_stats
+        self.set_bg_color(Color.BLACK)
+        self.initialize_background()
+        self.text = self.add_text(frame_stats.get_summary_text(), size=12)
+
+    def attach_to(self, top_view: View):
+        """Drawn last, so the overlay is on top of the other views"""
+        self.parent = top_view
+        top_view.add_child_view(self)
+        self.queue_for_background_update()
+
+    def on_frame(self):
+        if self.frame_stats.frame % self.REFRESH_FRAMES:
+            return
+        self.text.set_text(
+            self.frame_stats.get_summary_text(self.REFRESH_FRAMES))
+        self.queue_for_background_update()
@@ -1,10 +1,14 @@
 import logging
+import time
 
 import pygame
 
+from src.abstract.framestats_view import FrameStatsView
 from src.abstract.maindisplay import MainDisplay
 from src.helper.Misc.constants import MouseButton
+from src.helper.Misc.options_game import Options
 from src.helper.events import Publisher
+from src.helper.framestats import FrameStats
 
 # logging.getLogger().setLevel(logging.INFO)
 
@@ -30,12 +34,16 @@ class GameHandler:
         self.framerate = 60
         self.display: MainDisplay = None
         self.top_controller = None
+        self.frame_stats: FrameStats = None
+        self.frame_stats_view: FrameStatsView = None
 
         pygame.init()
         self.set_display()
         self.clock = pygame.time.Clock()
 
     def start(self):
+        if Options.frame_stats:
+            self.show_frame_stats()
         while self.is_running():  # the main loop
             self._do_game_frame()
         self._cleanup()
@@ -51,16 +59,48 @@ class GameHandler:
     def is_running(self):
         pass
 
+    def show_frame_stats(self):
+        """Times the frames from now on, see FrameStats"""
+        self.frame_stats = FrameStats()
+        self.frame_stats_view = FrameStatsView(self.frame_stats)
+        self.frame_stats_view.attach_to(self.display.top_view)
+
     def _cleanup(self):
+        if self.frame_stats:
+            self.frame_stats.close()
         print('Game ended normally!')
         pygame.quit()
 
     def _do_game_frame(self):
         """As long as the game is active this method is executed repeatedly"""
+        if self.frame_stats:
+            self._do_timed_game_frame()
+            return
+        self._process_input_events()
+        self._process_game_events()
+        self._blit_frame()
+        self._wait_until_next_frame()
+
+    def _do_timed_game_frame(self):
+        polled = self.publisher.polled_count
+        played = self.publisher.played_count
+        start_time = time.perf_counter()
         self._process_input_events()
+        input_time = time.perf_counter()
         self._process_game_events()
+        events_time = time.perf_counter()
         self._blit_frame()
+        blit_time = time.perf_counter()
         self._wait_until_next_frame()
+        end_time = time.perf_counter()
+        self.frame_stats.add_frame(
+            (input_time - start_time, events_time - input_time,
+             blit_time - events_time, end_time - blit_time),
+            (self.publisher.polled_count - polled,
+             self.publisher.played_count - played,
+             self.display.updated_rect_count,
+             self.display.redrawn_view_count))
+        self.frame_stats_view.on_frame()
 
     def _process_input_events(self):
         """get all mouse motions and process the last one only
@@ -89,7 +129,8 @@ class GameHandler:
             self.running = False
 
     def _process_game_events(self):
-        self.publisher.tick_events()
+        for _ in range(self.publisher.ticks_per_frame):
+            self.publisher.tick_events()
 
     def _blit_frame(self):
         self.display.blit_frame()
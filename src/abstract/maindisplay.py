@@ -16,6 +16,9 @@ class MainDisplay:
         self.screen = None
         self.top_view: View = None
         self.changed_rects = []
+        # what the last blit_frame did
+        self.redrawn_view_count = 0
+        self.updated_rect_count = 0
 
         self._add_self_reference_to_modules()
 
@@ -46,6 +49,9 @@ class MainDisplay:
 
     def blit_frame(self):
         updated = False
+        self.redrawn_view_count = len(
+            self.backgrounds_to_update | self.sprites_to_update)
+        self.updated_rect_count = 0
         if self.backgrounds_to_update:
             # logging.info(f'views to update: {self.backgrounds_to_update}')
             self._update_views_in_queue()
@@ -90,6 +96,7 @@ class MainDisplay:
         # pygame.display.update()
         # log_time(pygame.display.update, self.changed_rects)
         pygame.display.update(self.changed_rects)
+        self.updated_rect_count = len(self.changed_rects)
         self.changed_rects = []
 
     def blit(self, surface, pos):
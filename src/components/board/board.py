@@ -1,27 +1,37 @@
 import logging
+import os
 import random
 import re
+from array import array
+from collections import deque
 from math import floor
 
 from src.components.board.players import Player, PlayerList
 from src.components.board import players
 from src.components.board.monster import Monster
-from src.components.board.tile import Tile, TileModifier
-from src.helper.Misc.constants import ROOT, Terrain, AiType, is_odd
+from src.components.board.tile import BoardTile, TileModifier
+from src.components.board.mapfile import MapFile
+from src.components.board.mapgenerator import MapGenerator
+from src.helper.Misc.constants import MAP_DIRECTORY, Terrain, AiType, \
+    is_odd, TERRAIN_COUNT
 from src.helper.Misc.datatables import DataTables
 
 
 class TowerList:
     def __init__(self):
         self.towers = {}
+        # increased whenever a tower is added, removed or changes owner
+        self.version = 0
 
     def add_at(self, pos):
         assert pos not in self.towers
         self.towers[pos] = None
+        self.version += 1
 
     def remove_at(self, pos):
         assert pos in self.towers
         self.towers.pop(pos)
+        self.version += 1
 
     def exist_at(self, pos):
         return pos in self.towers
@@ -30,9 +40,15 @@ class TowerList:
         assert pos in self.towers, f'could not find {pos} in {self.towers}'
         return self.towers[pos]
 
+    def reset_to(self, posses):
+        """Replaces all towers with new towers without an owner at posses"""
+        self.towers = dict.fromkeys(posses)
+        self.version += 1
+
     def set_owner_at_pos(self, pos, owner):
         assert pos in self.towers
         self.towers[pos] = owner
+        self.version += 1
 
     def get_capturable_towers_for_player(self, player) -> dict:
         towers = {}
@@ -92,18 +108,115 @@ class MonsterList:
             self.monsters[player] = player.monsters
 
 
+class AdjacencyTable:
+    """Holds the adjacent posses of every pos on a board of a certain size
+
+    Tables are indexed the same way as the board arrays (x * y_max + y) and
+    are made once per board size, so boards of equal size share a table.
+    """
+    _tables = {}
+
+    @classmethod
+    def get_for_size(cls, x_max, y_max):
+        size = (x_max, y_max)
+        if size not in cls._tables:
+            cls._tables[size] = cls._make_table(x_max, y_max)
+        return cls._tables[size]
+
+    @classmethod
+    def _make_table(cls, x_max, y_max):
+        table = []
+        for x in range(x_max):
+            for y in range(y_max):
+                table.append(tuple(
+                    cls.compute_posses_adjacent_to((x, y), x_max, y_max)))
+        return tuple(table)
+
+    @classmethod
+    def compute_posses_adjacent_to(cls, pos, x_max, y_max):
+        """Boring but important stuff to retrieve all adjacent tiles"""
+        x, y = pos
+        adjacent_posses = []
+        cls._add_left_and_right_tiles(adjacent_posses, x, y, x_max)
+        # add top left, top right, bot left, bot right
+        if is_odd(y):
+            cls._add_odd_row_tiles(adjacent_posses, x, y, x_max, y_max)
+        else:
+            cls._add_even_row_tiles(adjacent_posses, x, y, y_max)
+        for pos in adjacent_posses:
+            assert pos[0] >= 0, f'could not get adj posses of {pos}'
+            assert pos[1] >= 0, f'could not get adj posses of {pos}'
+        return adjacent_posses
+
+    @staticmethod
+    def _add_left_and_right_tiles(adjacent_posses, x, y, x_max):
+        # left
+        if x - 1 >= 0:
+            adjacent_posses.append((x - 1, y))
+        # right
+        if x + 1 < x_max:
+            adjacent_posses.append((x + 1, y))
+
+    @staticmethod
+    def _add_odd_row_tiles(adjacent_posses, x, y, x_max, y_max):
+        if y - 1 >= 0:
+            adjacent_posses.append((x, y - 1))
+        if y - 1 >= 0 and x + 1 < x_max:
+            adjacent_posses.append((x + 1, y - 1))
+        if y + 1 < y_max:
+            adjacent_posses.append((x, y + 1))
+        if y + 1 < y_max and x + 1 < x_max:
+            adjacent_posses.append((x + 1, y + 1))
+
+    @staticmethod
+    def _add_even_row_tiles(adjacent_posses, x, y, y_max):
+        if y - 1 >= 0 and x - 1 >= 0:
+            adjacent_posses.append((x - 1, y - 1))
+        if y - 1 >= 0:
+            adjacent_posses.append((x, y - 1))
+        if y + 1 < y_max and x - 1 >= 0:
+            adjacent_posses.append((x - 1, y + 1))
+        if y + 1 < y_max:
+            adjacent_posses.append((x, y + 1))
+
+
 class Board:
     """Represent the board and everything on it, including monsters.
 
     Holds limited information about the game state. Rules and game state are
     stored by the board wrapper. It should only hold information about the
     pieces and terrain.
+
+    Terrain and monsters are kept in two flat, column-major arrays indexed by
+    x * y_max + y, instead of a grid of tile objects. Use tile_at only when a
+    tile-like object is needed, the other accessors index the arrays directly.
+
+    The version is increased on every change to terrain or monster positions,
+    so anything derived from the board can check if it is still up to date.
+    The posses involved in the most recent changes are kept as well, so it
+    can be checked where the board changed since a certain version. The
+    terrain version only increases when terrain changes.
+
+    For every terrain type that asked for it, the move cost of every tile is
+    kept in a grid with the same layout as the terrain, and updated whenever
+    terrain changes, so pathing doesn't have to look up costs per tile.
     """
+    MAX_CHANGES_KEPT = 512
 
     def __init__(self):
+        # boards are also made without a model, by tools and benchmarks
+        DataTables.ensure_loaded()
         self.y_max = None
         self.x_max = None
-        self.tiles = []
+        self.terrain = array('B')
+        self.occupants = []
+        self.adjacent_posses = ()
+        self.version = 0
+        self.terrain_version = 0
+        self.changes = deque(maxlen=self.MAX_CHANGES_KEPT)
+        self.move_costs = {}
+        # version of the data tables the move costs were made from
+        self.move_costs_version = DataTables.version
         self.monsters = MonsterList()
         self.towers = TowerList()
         self.lords = LordList()
@@ -113,29 +226,120 @@ class Board:
         self.players = players_
         self.monsters.load_from_players(players_)
 
+    def set_dimensions(self, x_max, y_max):
+        """Resize the board, every tile is reset to empty grass"""
+        assert x_max > 0 and y_max > 0
+        self.x_max = x_max
+        self.y_max = y_max
+        size = x_max * y_max
+        self.terrain = array('B', [Terrain.GRASS]) * size
+        self.occupants = [None] * size
+        self.adjacent_posses = AdjacencyTable.get_for_size(x_max, y_max)
+        self.move_costs.clear()
+        # everything changed, so older versions can no longer be compared
+        self.version += 1
+        self.terrain_version += 1
+        self.changes.clear()
+
     def on_tile(self, pos):
         return TileModifier(pos, self)
 
-    def tile_at(self, pos) -> Tile:
+    def tile_at(self, pos) -> BoardTile:
         assert self.is_valid_board_pos(pos), f'Invalid pos {pos}'
-        return self.tiles[pos[0]][pos[1]]
+        return BoardTile(self, pos)
+
+    def index_of(self, pos):
+        return pos[0] * self.y_max + pos[1]
 
     def terrain_at(self, pos):
-        return self.tile_at(pos).terrain
+        assert self.is_valid_board_pos(pos), f'Invalid pos {pos}'
+        return self.terrain[pos[0] * self.y_max + pos[1]]
 
     def monster_at(self, pos) -> Monster:
-        return self.tile_at(pos).monster
+        assert self.is_valid_board_pos(pos), f'Invalid pos {pos}'
+        return self.occupants[pos[0] * self.y_max + pos[1]]
+
+    def terrain_at_index(self, index):
+        """Unchecked, for loops over indices known to be on the board"""
+        return self.terrain[index]
+
+    def monster_at_index(self, index) -> Monster:
+        """Unchecked, for loops over indices known to be on the board"""
+        return self.occupants[index]
+
+    def get_move_costs(self, terrain_type) -> array:
+        """Returns the move cost grid for a terrain type, indexed like terrain
+
+        The grid is made on first use and kept up to date afterwards, do not
+        change it.
+        """
+        self.update_for_data_tables()
+        move_costs = self.move_costs.get(terrain_type)
+        if move_costs is None:
+            costs = [row[terrain_type] for row in DataTables.terrain_cost]
+            move_costs = array('B', [costs[terrain]
+                                     for terrain in self.terrain])
+            self.move_costs[terrain_type] = move_costs
+        return move_costs
+
+    def update_for_data_tables(self):
+        """Drops the move cost grids when the data tables were loaded again
+
+        The board then counts as changed everywhere. Caches of anything made
+        from the move costs call this before comparing board versions.
+        """
+        if self.move_costs_version == DataTables.version:
+            return
+        self.move_costs.clear()
+        self.move_costs_version = DataTables.version
+        self.version += 1
+        self.terrain_version += 1
+        self.changes.clear()
+
+    def move_cost_at(self, pos, terrain_type):
+        assert self.is_valid_board_pos(pos), f'Invalid pos {pos}'
+        return self.get_move_costs(terrain_type)[
+            pos[0] * self.y_max + pos[1]]
 
     def set_terrain_to(self, pos, terrain):
         """Change terrain type of tile at pos and update tower bookkeeping"""
+        assert self.is_valid_board_pos(pos), f'Invalid pos {pos}'
         if self.towers.exist_at(pos):
             self.towers.remove_at(pos)
-        self.tile_at(pos).terrain = terrain
+        index = self.index_of(pos)
+        self.terrain[index] = terrain
+        for terrain_type, move_costs in self.move_costs.items():
+            move_costs[index] = DataTables.terrain_cost[terrain][terrain_type]
         if terrain == Terrain.TOWER:
             if not self.towers.exist_at(pos):
                 self.towers.add_at(pos)
         if self.monster_at(pos):
             self.monster_at(pos).terrain = terrain
+        self.terrain_version += 1
+        self._record_change_at(pos)
+
+    def load_terrain(self, terrain, tower_posses=None):
+        """Replaces the terrain of every tile at once
+
+        Terrain is any bytes-like object laid out like self.terrain and is
+        copied in one go. The towers at tower_posses replace all towers, they
+        have no owner yet. Without tower_posses the towers are found in a
+        single scan of the terrain.
+        """
+        assert len(terrain) == self.x_max * self.y_max, (
+            f'Got {len(terrain)} tiles for a {self.x_max}x{self.y_max} board')
+        self.terrain = array('B')
+        self.terrain.frombytes(terrain)
+        if tower_posses is None:
+            tower_posses = MapFile.get_tower_posses(self.terrain, self.y_max)
+        self.towers.reset_to(tower_posses)
+        self.move_costs.clear()
+        for monster in filter(None, self.occupants):
+            monster.terrain = self.terrain_at(monster.pos)
+        # everything changed, so older versions can no longer be compared
+        self.version += 1
+        self.terrain_version += 1
+        self.changes.clear()
 
     def place_new_monster(self, monster_type, pos=(0, 0),
                           owner=None) -> Monster:
@@ -148,16 +352,18 @@ class Board:
             owner = self.get_current_player()
         new_monster = Monster(monster_type, pos, owner, self.terrain_at(pos))
         self.monsters.add(new_monster)
-        self.tile_at(new_monster.pos).monster = new_monster
+        self.occupants[self.index_of(new_monster.pos)] = new_monster
         owner.monster_count += 1
+        self._record_change_at(pos)
         return new_monster
 
     def remove_monster(self, monster):
         assert monster is not None
         logging.info(f'removing {monster.name}')
         self.monsters.remove(monster)
-        self.tile_at(monster.pos).monster = None
+        self.occupants[self.index_of(monster.pos)] = None
         monster.owner.monster_count -= 1
+        self._record_change_at(monster.pos)
 
     def has_tower_at(self, pos):
         return pos in self.towers
@@ -178,11 +384,10 @@ class Board:
         enemies = []
         adjacent_tiles = self.get_posses_adjacent_to(pos)
         for adj_pos in adjacent_tiles:
-            adj_tile = self.tile_at(adj_pos)
-            if (adj_tile.monster
-                    and adj_tile.monster.is_enemy_of(
-                        self.get_current_player())):
-                enemies.append(adj_tile.monster)
+            adj_monster = self.monster_at_index(self.index_of(adj_pos))
+            if (adj_monster
+                    and adj_monster.is_enemy_of(self.get_current_player())):
+                enemies.append(adj_monster)
         return enemies
 
     def get_lord_of(self, player):
@@ -192,54 +397,15 @@ class Board:
         return self.monsters.get_for(player)
 
     def get_posses_adjacent_to(self, pos):
-        """Boring but important stuff to retrieve all adjacent tiles
+        """Returns a tuple of all posses adjacent to pos
 
           @ | @
         @ | @ | @  <-- we are at the middle tile
           @ | @
-        """
-        x, y = pos
-        adjacent_posses = []
-        self._add_left_and_right_tiles(adjacent_posses, x, y)
-        # add top left, top right, bot left, bot right
-        row_is_odd = is_odd(y)
-        if row_is_odd:
-            self._add_odd_row_tiles(adjacent_posses, x, y)
-        else:
-            self._add_even_row_tiles(adjacent_posses, x, y)
-        for pos in adjacent_posses:
-            assert pos[0] >= 0, f'could not get adj posses of {pos}'
-            assert pos[1] >= 0, f'could not get adj posses of {pos}'
-
-        return adjacent_posses
-
-    def _add_left_and_right_tiles(self, adjacent_posses, x, y):
-        # left
-        if x - 1 >= 0:
-            adjacent_posses.append((x - 1, y))
-        # right
-        if x + 1 < self.x_max:
-            adjacent_posses.append((x + 1, y))
-
-    def _add_odd_row_tiles(self, adjacent_posses, x, y):
-        if y - 1 >= 0:
-            adjacent_posses.append((x, y - 1))
-        if y - 1 >= 0 and x + 1 < self.x_max:
-            adjacent_posses.append((x + 1, y - 1))
-        if y + 1 < self.y_max:
-            adjacent_posses.append((x, y + 1))
-        if y + 1 < self.y_max and x + 1 < self.x_max:
-            adjacent_posses.append((x + 1, y + 1))
 
-    def _add_even_row_tiles(self, adjacent_posses, x, y):
-        if y - 1 >= 0 and x - 1 >= 0:
-            adjacent_posses.append((x - 1, y - 1))
-        if y - 1 >= 0:
-            adjacent_posses.append((x, y - 1))
-        if y + 1 < self.y_max and x - 1 >= 0:
-            adjacent_posses.append((x - 1, y + 1))
-        if y + 1 < self.y_max:
-            adjacent_posses.append((x, y + 1))
+        Reads from the adjacency table made when the board was sized.
+        """
+        return self.adjacent_posses[pos[0] * self.y_max + pos[1]]
 
     def is_valid_board_pos(self, pos):
         x, y = pos
@@ -257,10 +423,34 @@ class Board:
 
     def set_monster_pos(self, monster, new_pos):
         """Ignores movement check, useful for spell effects, or testing"""
-        self.tile_at(monster.pos).monster = None
-        self.tile_at(new_pos).monster = monster
+        assert self.is_valid_board_pos(new_pos), f'Invalid pos {new_pos}'
+        old_pos = monster.pos
+        self.occupants[self.index_of(old_pos)] = None
+        self.occupants[self.index_of(new_pos)] = monster
         monster.pos = new_pos
         monster.terrain = self.terrain_at(new_pos)
+        self._record_change_at(old_pos, new_pos)
+
+    def _record_change_at(self, *posses):
+        self.version += 1
+        self.changes.append((self.version, posses))
+
+    def get_posses_changed_since(self, version):
+        """Returns a set of posses that changed after the given version
+
+        Returns None if the changes are not known that far back, in that case
+        anything could have changed.
+        """
+        posses = set()
+        if version == self.version:
+            return posses
+        if not self.changes or self.changes[0][0] > version + 1:
+            return None
+        for change_version, changed_posses in reversed(self.changes):
+            if change_version <= version:
+                break
+            posses.update(changed_posses)
+        return posses
 
     def capture_terrain_at(self, pos, player):
         """Change tower count if a tower was captured, and change tile owner"""
@@ -303,11 +493,12 @@ class BoardPrinter:
         for y in range(self.board.y_max):
             row = []
             for x in range(self.board.x_max):
-                tile = self.board.tile_at((x, y))
-                if tile.monster:
-                    row.append(self.monster_to_char(tile.monster))
+                monster = self.board.monster_at((x, y))
+                if monster:
+                    row.append(self.monster_to_char(monster))
                 else:
-                    row.append(self.terrain_to_char[tile.terrain])
+                    row.append(
+                        self.terrain_to_char[self.board.terrain_at((x, y))])
             if y % 2 == 0:
                 print(' '.join(row))
             else:
@@ -344,8 +535,6 @@ class AbstractBoardBuilder:
         layout = self.layout
         self.x_max = layout[0]
         self.y_max = layout[1]
-        self.board.x_max = self.x_max
-        self.board.y_max = self.y_max
         self._fill_with_grass_tiles()
         assert len(layout) - 10 == self.x_max * self.y_max, (
                 f'Error setting terrain layout, {self.x_max}:{self.y_max} but '
@@ -357,17 +546,12 @@ class AbstractBoardBuilder:
     def _fill_with_grass_tiles(self):
         assert self.x_max
         assert self.y_max
-        for x in range(self.x_max):
-            self.board.tiles.append([])
-            for y in range(self.y_max):
-                self.board.tiles[x].append(Tile(Terrain.GRASS))
+        self.board.set_dimensions(self.x_max, self.y_max)
 
     def _set_terrain_from_layout(self, layout):
-        n = 2
-        for x in range(self.x_max):
-            for y in range(self.y_max):
-                self.board.set_terrain_to((x, y), layout[n])
-                n += 1
+        # the layout lists the terrain in the same order as the board
+        self.board.load_terrain(
+            array('B', layout[2:2 + self.x_max * self.y_max]))
 
     def _create_players(self):
         for id_ in range(self.mapoptions.number_of_players):
@@ -426,6 +610,11 @@ class AbstractBoardBuilder:
 
 
 class BoardBuilder(AbstractBoardBuilder):
+    def __init__(self, rng=random):
+        super().__init__()
+        # only used to generate maps
+        self.rng = rng
+
     def load_default_map(self) -> Board:
         mapoptions = MapOptions()
         mapoptions.mapname = 'test'
@@ -441,8 +630,14 @@ class BoardBuilder(AbstractBoardBuilder):
             self.mapoptions.mapname = 'test.map'
         else:
             test = False
-        self._get_layout_from_map_file()
-        self.set_map_using_layout()
+        if self.mapoptions.mapname == 'generated':
+            test = True
+            self._generate_map()
+        elif self.mapoptions.mapname.endswith(MapFile.EXTENSION):
+            self._load_map_file()
+        else:
+            self._get_layout_from_map_file()
+            self.set_map_using_layout()
         self._add_lords()
         if test:
             self._generate_towers_around_lords()
@@ -450,10 +645,28 @@ class BoardBuilder(AbstractBoardBuilder):
 
     def _get_layout_from_map_file(self):
         assert self.mapoptions.mapname, 'No mapname set'
-        with open(f'{ROOT}/src/data/maps/{self.mapoptions.mapname}', 'r') as fd:
+        with open(self._get_map_path(), 'r') as fd:
             content = fd.read()
         self._get_layout_from_content(content)
 
+    def _load_map_file(self):
+        self._load_from_map_file(MapFile.read(self._get_map_path()))
+
+    def _generate_map(self):
+        self._load_from_map_file(MapGenerator(self.rng).generate(
+            *self.mapoptions.map_size))
+
+    def _load_from_map_file(self, map_file: MapFile):
+        self.x_max = map_file.x_max
+        self.y_max = map_file.y_max
+        self._fill_with_grass_tiles()
+        self.board.load_terrain(map_file.terrain, map_file.towers)
+        self.start_posses = list(map_file.start_posses)
+
+    def _get_map_path(self):
+        """Map names are relative to the map directory, unless absolute"""
+        return os.path.join(MAP_DIRECTORY, self.mapoptions.mapname)
+
     def _get_layout_from_content(self, content):
         layout_strings = content.split(', ')
         layout = []
@@ -542,19 +755,21 @@ class BoardTextBuilder(AbstractBoardBuilder):
 
     # override
     def _set_terrain_from_layout(self, layout):
-        for x in range(self.x_max):
-            for y in range(self.y_max):
-                self.board.set_terrain_to(
-                    (x, y), layout[2 + x + y * self.x_max])
+        # the text is read row by row, the board is laid out column by column
+        self.board.load_terrain(array('B', [
+            layout[2 + x + y * self.x_max]
+            for x in range(self.x_max) for y in range(self.y_max)]))
 
 
 class RandomBoardBuilder(AbstractBoardBuilder):
+    def __init__(self, rng=random):
+        super().__init__()
+        self.rng = rng
+
     def load_map(self, x_max, y_max, mapoptions) -> Board:
         self.mapoptions = mapoptions
         self.x_max = x_max
         self.y_max = y_max
-        self.board.x_max = self.x_max
-        self.board.y_max = self.y_max
         self._fill_with_grass_tiles()
         self._randomize_terrain()
         self._set_default_mapoption_values_if_not_specified()
@@ -562,18 +777,21 @@ class RandomBoardBuilder(AbstractBoardBuilder):
         return self.board
 
     def _randomize_terrain(self):
-        pos = (self._get_random_x(), self._get_random_y())
-        for terrain in range(13):
-            for i in range(round(self.x_max * self.y_max * 0.05)):
-                while self.board.terrain_at(pos) != Terrain.GRASS:
-                    pos = (self._get_random_x(), self._get_random_y())
-                self.board.on_tile(pos).set_terrain_to(terrain)
-
-    def _get_random_y(self):
-        return random.randint(0, self.y_max - 1)
+        """Turns 5% of the tiles into each terrain other than grass
 
-    def _get_random_x(self):
-        return random.randint(0, self.x_max - 1)
+        The tiles are drawn without replacement in one go, instead of drawing
+        positions until one is still grass.
+        """
+        terrain_plane = bytearray(self.board.terrain.tobytes())
+        size = self.x_max * self.y_max
+        count = round(size * 0.05)
+        terrains = [terrain for terrain in range(TERRAIN_COUNT)
+                    if terrain != Terrain.GRASS]
+        indices = self.rng.sample(range(size), count * len(terrains))
+        for n, terrain in enumerate(terrains):
+            for index in indices[n * count:(n + 1) * count]:
+                terrain_plane[index] = terrain
+        self.board.load_terrain(terrain_plane)
 
 
 class MapOptions:
@@ -581,10 +799,14 @@ class MapOptions:
         self.players: PlayerList = PlayerList()
         self.number_of_players = None
         self.mapname = None
+        # width and height of generated maps
+        self.map_size = (64, 64)
         self.lord_types = {}
         self.ai_types = {}
         self.teams = {}
         self.starting_mp = {}
+        # the game draws its random numbers from this, None for a random one
+        self.seed = None
 
     def set_number_of_players(self, number):
         self.number_of_players = number
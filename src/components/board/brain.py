@@ -1,10 +1,7 @@
 import logging
-import random
-from math import ceil
 
 from src.components.board.pathing import PathFactory, PathMatrixFactory
-from src.components.board.pathing_components import PathMatrix, \
-    TowerSearchMatrixFactory
+from src.components.board.pathing_components import PathMatrix
 from src.helper.Misc.datatables import DataTables
 from src.model import board_model
 
@@ -105,7 +102,8 @@ class PlayerDefaultBrain(PlayerBrain):
         if self.monster_to_summon is None:
             summon_options = DataTables.get_summon_options(
                 self.player.lord_type)
-            self.monster_to_summon = random.choice(summon_options)
+            self.monster_to_summon = self.model.random.ai.choice(
+                summon_options)
             logging.info(f'AI Setting monster to summon to '
                          f'{self.monster_to_summon}')
         if self._possible_to_summon():
@@ -172,19 +170,18 @@ class OptimalAttackFinder:
         return self.optimal_attack
 
     def _update_best_score(self, attack_range, enemy):
-        damage1, damage2 = self.model.get_expected_damage_between(
+        outcome = self.model.get_combat_outcome_between(
             self.monster, enemy, attack_range)
-        if damage1 <= 0:
+        expected_hp_enemy = outcome.get_expected_hp(1)
+        if expected_hp_enemy >= enemy.hp:
             return
-        # 1 turn defeats should always be attacked
-        turns_to_defeat = ceil(enemy.hp / damage1)
-        if turns_to_defeat == 1:
-            score = 1
-        # prioritize highest % of hp caused in damage
-        else:
-            damage_percent1 = damage1 / enemy.stats.max_hp
-            damage_percent2 = damage2 / self.monster.stats.max_hp
-            score = damage_percent1 - damage_percent2
+        # chances of killing or being killed count the most, then the % of
+        # hp caused in damage
+        damage_percent1 = (enemy.hp - expected_hp_enemy) / enemy.stats.max_hp
+        damage_percent2 = ((self.monster.hp - outcome.get_expected_hp(0))
+                           / self.monster.stats.max_hp)
+        score = (outcome.get_kill_chance(1) - outcome.get_kill_chance(0)
+                 + damage_percent1 - damage_percent2)
         if score > self.best_score:
             self.best_score = score
             self.optimal_attack.monster_to_attack = enemy
@@ -197,9 +194,10 @@ class MonsterBrain:
         self.controller = controller
         self.model = controller.model
         self.board = self.model.board
-        self.path_finder = PathFactory(self.board)
-        self.matrix_factory = PathMatrixFactory(self.board)
-        self.towersearch_matrix_factory = TowerSearchMatrixFactory(self.board)
+        self.path_finder = PathFactory(
+            self.board, self.model.destination_field_factory)
+        # shared so matrices stay cached between actions and turns
+        self.matrix_factory: PathMatrixFactory = self.model.matrix_factory
         self.matrix: PathMatrix = None
         self.destination_pos = None
         self.monster_to_attack = None
@@ -257,10 +255,11 @@ class MonsterBrain:
         assert self.destination_pos
 
     def _set_destination_to_closest_tower(self):
-        tower_matrix = self.towersearch_matrix_factory \
-            .generate_path_matrix(self.monster.pos)
-        if tower_matrix.end:
-            self.destination_pos = tower_matrix.end
+        tower_field = self.model.tower_field_factory.get_field_for(
+            self.monster.owner, self.monster.terrain_type)
+        tower_pos = tower_field.get_closest_tower_from(self.monster.pos)
+        if tower_pos:
+            self.destination_pos = tower_pos
 
     def _set_destination_to_enemy_lord(self, player):
         # go to enemy lord
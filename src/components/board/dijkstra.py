@@ -1,5 +1,5 @@
+import heapq
 from decimal import Decimal
-from src.helper.Misc.datatables import DataTables
 from src.helper.dictionaryprinter import DictionaryPrinter
 
 
@@ -24,20 +24,35 @@ class Edge:
 
 
 class DijkstraGraph:
-    """Copied and modified from someone on the internet"""
+    """Copied and modified from someone on the internet
+
+    Used as a reference to validate path matrices. Edges are only made for
+    nodes the search actually reaches, and the next node is picked with a
+    binary heap on integer distances. Unreached nodes get INFINITY in the
+    returned dist and prev, like the original version that scanned all
+    unvisited nodes.
+    """
     INFINITY = Decimal('Infinity')
+    _node_orders = {}
 
     def __init__(self, board, monster):
         self.board = board
         self.monster = monster
         self.terrain_type = monster.terrain_type
+        self.move_costs = board.get_move_costs(monster.terrain_type)
         self.edges = {}
-        self._make_from_board()
+        self.nodes_with_edges_made = set()
 
-    def _make_from_board(self):
+    def make_all_edges(self):
         for x in range(self.board.x_max):
             for y in range(self.board.y_max):
-                self._add_edges_starting_at((x, y))
+                self._get_edges_from((x, y))
+
+    def _get_edges_from(self, pos):
+        if pos not in self.nodes_with_edges_made:
+            self.nodes_with_edges_made.add(pos)
+            self._add_edges_starting_at(pos)
+        return self.edges.get(pos, {})
 
     def _add_edges_starting_at(self, pos):
         adj_posses = self.board.get_posses_adjacent_to(pos)
@@ -45,21 +60,20 @@ class DijkstraGraph:
             if self._cannot_move_from_pos(adj_posses):
                 return
         for adj_pos in adj_posses:
-            terrain = self.board.terrain_at(adj_pos)
-            move_cost = DataTables.get_terrain_cost(
-                terrain, self.terrain_type)
+            move_cost = self.move_costs[self.board.index_of(adj_pos)]
             if self._can_move_to(adj_pos, move_cost):
                 self._add_edge(pos, adj_pos, move_cost)
 
     def _cannot_move_from_pos(self, adj_posses):
         for adj_pos in adj_posses:
-            adj_monster = self.board.monster_at(adj_pos)
+            adj_monster = self.board.monster_at_index(
+                self.board.index_of(adj_pos))
             if adj_monster and adj_monster.owner != self.monster.owner:
                 return True
         return False
 
     def _can_move_to(self, pos, move_cost):
-        monster_at_pos = self.board.monster_at(pos)
+        monster_at_pos = self.board.monster_at_index(self.board.index_of(pos))
         if monster_at_pos and monster_at_pos.owner != self.monster.owner:
             return False
         return move_cost < 99
@@ -72,43 +86,52 @@ class DijkstraGraph:
         from_node_edges[to_node] = edge
 
     def dijkstra(self, source):
-        unvisited_nodes = set()
-        dist = {}
-        prev = {}
+        """Returns the distance and previous node of every pos on the board
 
+        Nodes with equal distance are visited in the order a set of all
+        posses iterates in, so prev is identical to scanning that set for the
+        node with the least distance.
+        """
+        node_order = self._get_node_order()
+        visited = set()
+        dist = {source: 0}
+        prev = {}
+        nodes_to_visit = [(0, node_order[source], source)]
+        while nodes_to_visit:
+            node_dist, _, node = heapq.heappop(nodes_to_visit)
+            if node in visited:
+                continue
+            visited.add(node)
+            for to_node, edge in self._get_edges_from(node).items():
+                alt = node_dist + edge.length
+                if to_node not in dist or alt < dist[to_node]:
+                    # a shorter path to edge has been found
+                    dist[to_node] = alt
+                    prev[to_node] = node
+                    heapq.heappush(
+                        nodes_to_visit, (alt, node_order[to_node], to_node))
+        return self._fill_unreached_nodes(dist, prev)
+
+    def _get_node_order(self):
+        size = (self.board.x_max, self.board.y_max)
+        if size not in self._node_orders:
+            nodes = set()
+            for x in range(self.board.x_max):
+                for y in range(self.board.y_max):
+                    nodes.add((x, y))
+            self._node_orders[size] = {
+                node: n for n, node in enumerate(nodes)}
+        return self._node_orders[size]
+
+    def _fill_unreached_nodes(self, dist, prev):
+        full_dist = {}
+        full_prev = {}
         for x in range(self.board.x_max):
             for y in range(self.board.y_max):
-                dist[(x, y)] = self.INFINITY
-                prev[(x, y)] = self.INFINITY
-                unvisited_nodes.add((x, y))
-
-        # distance from source to source
-        dist[source] = 0
-        while unvisited_nodes:
-            # node with the least distance selected first
-            node = self._min_dist(unvisited_nodes, dist)
-            unvisited_nodes.remove(node)
-            if node in self.edges:
-                for _, edge in self.edges[node].items():
-                    alt = dist[node] + edge.length
-                    if alt < dist[edge.to_node]:
-                        # a shorter path to edge has been found
-                        dist[edge.to_node] = alt
-                        prev[edge.to_node] = node
-        return dist, prev
-
-    def _min_dist(self, q, dist):
-        """
-        Returns the node with the smallest distance in q.
-        Implemented to keep the main algorithm clean.
-        """
-        min_node = None
-        for node in q:
-            if min_node is None:
-                min_node = node
-            elif dist[node] < dist[min_node]:
-                min_node = node
-        return min_node
+                pos = (x, y)
+                full_dist[pos] = dist.get(pos, self.INFINITY)
+                full_prev[pos] = prev.get(pos, self.INFINITY)
+        return full_dist, full_prev
 
     def get_printable_values(self, dist):
         printer = DijkstraPrinter(dist)
@@ -0,0 +1,93 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from src.helper.Misc.constants import Terrain
+
+
+class MapFile:
+    """A map stored as binary, to load large maps quickly
+
+    The file is a header followed by the start posses, the tower posses and
+    the terrain of every tile as one byte each. The terrain is laid out like
+    Board.terrain, so it is copied to the board in one go, straight from the
+    memory mapped file.
+    """
+    EXTENSION = '.bmap'
+    _MAGIC = b'MOM1'
+    _HEADER = struct.Struct('<4sHHBI')  # magic, x_max, y_max, starts, towers
+    _POS = struct.Struct('<HH')
+
+    def __init__(self, x_max, y_max, start_posses, towers, terrain):
+        self.x_max = x_max
+        self.y_max = y_max
+        self.start_posses = tuple(start_posses)
+        self.towers = tuple(towers)
+        self.terrain: array = terrain
+
+    @classmethod
+    def read(cls, path) -> 'MapFile':
+        with open(path, 'rb') as fd, \
+                mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, x_max, y_max, starts, towers = cls._HEADER.unpack_from(data)
+            assert magic == cls._MAGIC, f'{path} is not a binary map'
+            offset = cls._HEADER.size
+            posses = [cls._POS.unpack_from(data, offset + n * cls._POS.size)
+                      for n in range(starts + towers)]
+            offset += len(posses) * cls._POS.size
+            size = x_max * y_max
+            assert len(data) - offset == size, (
+                f'{path} has {len(data) - offset} tiles, expected {size}')
+            terrain = array('B')
+            with memoryview(data) as view:
+                terrain.frombytes(view[offset:offset + size])
+        return cls(x_max, y_max, posses[:starts], posses[starts:], terrain)
+
+    def write(self, path):
+        with open(path, 'wb') as fd:
+            fd.write(self._HEADER.pack(
+                self._MAGIC, self.x_max, self.y_max, len(self.start_posses),
+                len(self.towers)))
+            for pos in self.start_posses + self.towers:
+                fd.write(self._POS.pack(*pos))
+            self.terrain.tofile(fd)
+
+    @classmethod
+    def from_layout(cls, layout) -> 'MapFile':
+        """Makes a binary map from the layout of a text map
+
+        See AbstractBoardBuilder.set_map_using_layout for the layout.
+        """
+        x_max, y_max = layout[0], layout[1]
+        terrain = array('B', layout[2:2 + x_max * y_max])
+        starts = layout[2 + x_max * y_max:]
+        start_posses = [(starts[n], starts[n + 1])
+                        for n in range(0, len(starts), 2)]
+        return cls(x_max, y_max, start_posses,
+                   cls.get_tower_posses(terrain, y_max), terrain)
+
+    @staticmethod
+    def get_tower_posses(terrain: array, y_max):
+        posses = []
+        tiles = terrain.tobytes()
+        index = tiles.find(Terrain.TOWER)
+        while index != -1:
+            posses.append(divmod(index, y_max))
+            index = tiles.find(Terrain.TOWER, index + 1)
+        return posses
+
+
+def convert_text_map(path):
+    """Writes a binary copy of a text map next to it, returns its path"""
+    with open(path, 'r') as fd:
+        layout = [int(value) for value in fd.read().split(',')]
+    binary_path = os.path.splitext(path)[0] + MapFile.EXTENSION
+    MapFile.from_layout(layout).write(binary_path)
+    return binary_path
+
+
+if __name__ == '__main__':
+    for text_path in sys.argv[1:]:
+        print(f'{text_path} -> {convert_text_map(text_path)}')
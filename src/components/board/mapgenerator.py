@@ -0,0 +1,132 @@
+import random
+import sys
+from array import array
+
+from src.components.board.mapfile import MapFile
+from src.helper.Misc.constants import Terrain
+
+
+class MapGenerator:
+    """Makes playable maps of any size in time linear in the number of tiles
+
+    Terrain comes in regions: the board is split into square cells that each
+    get a random terrain, and every tile is shifted a little at random before
+    looking up its cell, so regions get ragged borders. Four start posses are
+    placed towards the corners, each in a grass clearing with a castle in the
+    middle, and grass roads lead from them to the centre so every lord can
+    reach the others. Towers are spread evenly, one somewhere in every block
+    of tiles.
+    """
+    REGION_SIZE = 8
+    TOWER_SPACING = 10
+    CLEARING_SIZE = 2
+    MIN_SIZE = 16
+    STARTS = 4
+    # terrain of the regions and how often they come up
+    region_terrains = {Terrain.GRASS: 12, Terrain.FOREST: 5,
+                       Terrain.MOUNTAIN: 2, Terrain.ROCKY: 2, Terrain.DUNE: 2,
+                       Terrain.SWAMP: 2, Terrain.TUNDRA: 2, Terrain.OCEAN: 3,
+                       Terrain.RIVER: 1, Terrain.VOLCANO: 1}
+    # towers are not put on these
+    tower_blockers = (Terrain.OCEAN, Terrain.VOLCANO, Terrain.CASTLE)
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.x_max = None
+        self.y_max = None
+        self.terrain = None
+        self.start_posses = None
+
+    def generate(self, x_max, y_max) -> MapFile:
+        assert x_max >= self.MIN_SIZE and y_max >= self.MIN_SIZE, (
+            f'Maps need to be at least {self.MIN_SIZE}x{self.MIN_SIZE}')
+        self.x_max = x_max
+        self.y_max = y_max
+        self.terrain = self._make_regions()
+        self.start_posses = self._get_start_posses()
+        centre = (x_max // 2, y_max // 2)
+        for pos in self.start_posses:
+            self._make_road(pos, centre)
+        for pos in self.start_posses:
+            self._make_clearing(pos)
+        towers = self._place_towers()
+        return MapFile(x_max, y_max, self.start_posses, towers, self.terrain)
+
+    def _make_regions(self):
+        size = self.REGION_SIZE
+        cells_x = self.x_max // size + 2
+        cells_y = self.y_max // size + 2
+        cells = self.rng.choices(
+            tuple(self.region_terrains), tuple(self.region_terrains.values()),
+            k=cells_x * cells_y)
+        # one random byte per tile, its halves shift the tile along x and y
+        shifts = self.rng.randbytes(self.x_max * self.y_max)
+        terrain = array('B')
+        index = 0
+        for x in range(self.x_max):
+            for y in range(self.y_max):
+                shift = shifts[index]
+                cell_x = (x + (shift & 15) * size // 16) // size
+                cell_y = (y + (shift >> 4) * size // 16) // size
+                terrain.append(cells[cell_x * cells_y + cell_y])
+                index += 1
+        return terrain
+
+    def _get_start_posses(self):
+        x_min = self.x_max // 6
+        y_min = self.y_max // 6
+        x_max = self.x_max - 1 - x_min
+        y_max = self.y_max - 1 - y_min
+        # opposite corners first, so two players start far apart
+        return ((x_min, y_min), (x_max, y_max), (x_max, y_min),
+                (x_min, y_max))[:self.STARTS]
+
+    def _make_road(self, start, end):
+        """A grass road, first along x and then along y"""
+        x, y = start
+        step_x = 1 if end[0] > x else -1
+        for x in range(x, end[0] + step_x, step_x):
+            self._set_terrain_at((x, y), Terrain.GRASS)
+        step_y = 1 if end[1] > y else -1
+        for y in range(y, end[1] + step_y, step_y):
+            self._set_terrain_at((x, y), Terrain.GRASS)
+
+    def _make_clearing(self, pos):
+        clearing = self.CLEARING_SIZE
+        for x in range(pos[0] - clearing, pos[0] + clearing + 1):
+            for y in range(pos[1] - clearing, pos[1] + clearing + 1):
+                self._set_terrain_at((x, y), Terrain.GRASS)
+        self._set_terrain_at(pos, Terrain.CASTLE)
+
+    def _place_towers(self):
+        spacing = self.TOWER_SPACING
+        towers = []
+        for block_x in range(0, self.x_max, spacing):
+            for block_y in range(0, self.y_max, spacing):
+                pos = (self.rng.randrange(
+                           block_x, min(block_x + spacing, self.x_max)),
+                       self.rng.randrange(
+                           block_y, min(block_y + spacing, self.y_max)))
+                if self._can_have_tower_at(pos):
+                    self._set_terrain_at(pos, Terrain.TOWER)
+                    towers.append(pos)
+        return towers
+
+    def _can_have_tower_at(self, pos):
+        if self._get_terrain_at(pos) in self.tower_blockers:
+            return False
+        # leave the clearings to the towers built around the lords
+        return all(max(abs(pos[0] - x), abs(pos[1] - y)) > self.CLEARING_SIZE
+                   for x, y in self.start_posses)
+
+    def _get_terrain_at(self, pos):
+        return self.terrain[pos[0] * self.y_max + pos[1]]
+
+    def _set_terrain_at(self, pos, terrain):
+        self.terrain[pos[0] * self.y_max + pos[1]] = terrain
+
+
+if __name__ == '__main__':
+    # python -m src.components.board.mapgenerator <width> <height> <path>
+    width, height, path = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+    MapGenerator().generate(width, height).write(path)
@@ -21,6 +21,7 @@ class Monster:
 
     def __init__(self, monster_type, pos, owner, terrain):
         assert type(owner) is not int
+        DataTables.ensure_loaded()
         self.pos = pos
         self.owner: Player = owner
         self.terrain = terrain
@@ -51,7 +52,8 @@ class Monster:
         self.exp += exp
 
     def will_promote_with_exp(self, exp):
-        return self.exp + exp >= self.stats.max_exp
+        return (self.stats.promotion is not None
+                and self.exp + exp >= self.stats.max_exp)
 
     def promote(self):
         assert self.stats.promotion, (
@@ -63,13 +65,13 @@ class Monster:
         if self.type <= MonsterType.SIXTHLORD:
             return True
 
-    def tower_heal(self):
+    def tower_heal(self, rng=random):
         """Should be triggered when monster ends turn on tower
 
         todo check how much health is restored (flat amount?)
         seems to be 10±4, independent of max hp
         """
-        self.heal(random.randint(6, 14))
+        self.heal(rng.randint(6, 14))
 
     def heal(self, amount):
         self.hp += amount
@@ -1,6 +1,7 @@
 from src.components.board.pathing_components import FullMatrixProcessor, \
     PathFinder, PathMatrix, MatrixFactory, AStarMatrixFactory, \
     TowerSearchMatrixFactory, SimplePathFinder
+from src.helper.Misc.options_game import Options
 
 
 class PathMatrixFactory(MatrixFactory):
@@ -17,19 +18,68 @@ class PathMatrixFactory(MatrixFactory):
     multiple turns.
     * The search matrix requires a target to search for. This
     target may be multiple turns away.
+
+    Regular matrices are cached per monster. When the board has changed since
+    a matrix was made, the matrix is only discarded if the changes were on or
+    next to the tiles it explored.
     """
 
+    def __init__(self, board):
+        super().__init__(board)
+        self.cached_matrices = {}
+
     def generate_path_matrix(self, start) -> PathMatrix:
         """Gets all distance values starting with 1 turn of movement"""
-        self.matrix = PathMatrix(self.board)
         monster = self.board.monster_at(start)
-        self.matrix.set_monster(monster)
         assert monster
+        cached_matrix = self._get_cached_matrix_for(monster)
+        if cached_matrix:
+            self.matrix = cached_matrix
+            return self.matrix
+        self.matrix = PathMatrix(self.board)
+        self.matrix.set_monster(monster)
         self.processor = FullMatrixProcessor(self.matrix)
         max_move_points = monster.stats.move_points
         self.processor.fill_distance_values(start, max_move_points)
+        if Options.validate_path_matrices:
+            self.matrix.check_validity()
+        self._cache_matrix_for(monster)
         return self.matrix
 
+    def _get_cached_matrix_for(self, monster):
+        if monster not in self.cached_matrices:
+            return None
+        key, version, matrix = self.cached_matrices[monster]
+        self.board.update_for_data_tables()
+        if key != self._get_cache_key_for(monster):
+            return None
+        if version != self.board.version:
+            changed_posses = self.board.get_posses_changed_since(version)
+            if (changed_posses is None
+                    or matrix.is_affected_by_change_at(changed_posses)):
+                self.cached_matrices.pop(monster)
+                return None
+            self.cached_matrices[monster] = (key, self.board.version, matrix)
+        return matrix
+
+    def _cache_matrix_for(self, monster):
+        self._remove_monsters_no_longer_on_board()
+        self.cached_matrices[monster] = (
+            self._get_cache_key_for(monster), self.board.version, self.matrix)
+
+    def _remove_monsters_no_longer_on_board(self):
+        for monster in tuple(self.cached_matrices):
+            if self.board.monster_at(monster.pos) is not monster:
+                self.cached_matrices.pop(monster)
+
+    def _get_cache_key_for(self, monster):
+        """Besides the board, the matrix depends on these
+
+        Promotions change the monster type and enemies are decided by the
+        current player.
+        """
+        return monster.pos, monster.type, self.board.get_current_player()
+
 
 class PathFactory:
     """ Returns the shortest path between two points.
@@ -43,9 +93,10 @@ class PathFactory:
     monster (using its movement properties) and an arbitrary end point.
     """
 
-    def __init__(self, board):
+    def __init__(self, board, destination_field_factory=None):
         self.board = board
         self.path_generator = PathFinder(board)
+        self.destination_field_factory = destination_field_factory
 
     def get_path_on_matrix_to(self, matrix, end):
         """Returns path to end on given matrix"""
@@ -64,7 +115,16 @@ class PathFactory:
         return self.path_generator.get_path_on(path_matrix)
 
     def get_simple_path_between(self, beginning, end):
-        """Returns path between given positions"""
+        """Returns path between given positions
+
+        Many monsters head for the lords, so paths to a lord are read from a
+        destination field shared by all monsters of the same terrain type.
+        """
+        if self._is_lord_position(end):
+            monster = self.board.monster_at(beginning)
+            field = self.destination_field_factory.get_field_for(
+                end, monster.terrain_type)
+            return field.get_path_from(beginning, monster.stats.move_points)
         matrix_factory = AStarMatrixFactory(self.board)
         path_matrix = matrix_factory.generate_path_matrix(beginning, end)
         # we use simple path (ignores monster collision and zone of control
@@ -73,6 +133,12 @@ class PathFactory:
         self.path_generator = SimplePathFinder(self.board)
         return self.path_generator.get_path_on(path_matrix)
 
+    def _is_lord_position(self, pos):
+        if not self.destination_field_factory:
+            return False
+        monster = self.board.monster_at(pos)
+        return monster is not None and monster.is_lord()
+
     def get_path_to_tower(self, beginning):
         """Returns path to nearest tower type"""
         matrix_factory = TowerSearchMatrixFactory(self.board)
@@ -7,7 +7,6 @@ from src.components.board.dijkstra import DijkstraGraph, SimpleDijkstraGraph
 from src.helper.dictionaryprinter import DictionaryPrinter
 from src.helper import functions
 from src.helper.Misc.constants import IMPASSIBLE, UNEXPLORED
-from src.helper.Misc.datatables import DataTables
 
 
 class PathMatrix:
@@ -25,7 +24,8 @@ class PathMatrix:
         self.dist_values = {}
         self.heuristic = {}
         self.accessible_positions = set()
-        self.enemies = set()
+        # a dict used as an ordered set, like players.Monsters
+        self.enemies = {}
         self.explored_tiles = set()
 
     def set_heuristic_value_at(self, pos, value):
@@ -54,6 +54,21 @@ class PathMatrix:
         self.monster = monster
         self.start = monster.pos
 
+    def is_affected_by_change_at(self, posses):
+        """Returns true if changes at posses may change the distance values
+
+        Processing a tile reads the terrain and monsters of the tiles adjacent
+        to it, so only changes on or next to an explored tile matter.
+        """
+        explored_tiles = self.explored_tiles
+        for pos in posses:
+            if pos in explored_tiles:
+                return True
+            for adj_pos in self.board.get_posses_adjacent_to(pos):
+                if adj_pos in explored_tiles:
+                    return True
+        return False
+
     def get_printable_dist_values(self):
         printer = MatrixPrinter(self)
         return printer.get_printable_dist_values()
@@ -122,8 +137,7 @@ class MatrixPrinter(DictionaryPrinter):
             val = self.matrix.get_heuristic_value_at(pos)
         else:
             terrain_type = self.matrix.monster.terrain_type
-            terrain = self.matrix.board.terrain_at(pos)
-            val = DataTables.get_terrain_cost(terrain, terrain_type)
+            val = self.matrix.board.move_cost_at(pos, terrain_type)
         if val is None:
             return '  '
         else:
@@ -156,22 +170,27 @@ class MatrixProcessor:
         self.pos = None
         self.cannot_move_from_pos = None
         self.max_dist_value = None
+        self.move_costs = None
 
     def _process_tiles(self, start):
         self._setup_processing(start)
         self._explore_tiles()
 
     def _explore_tiles(self):
+        # a tile is explored again when a cheaper way to it is found, but a
+        # matrix that explores this often is stuck
+        max_explorations = max(1000, 8 * self.board.x_max * self.board.y_max)
         n = 0
-        while n < 1000:
+        while n < max_explorations:
             if self.matrix_is_finished():
                 break
             self._explore_next_tile()
             n += 1
-        assert n < 1000, 'Matrix took too long to process'
+        assert n < max_explorations, 'Matrix took too long to process'
 
     def _setup_processing(self, start):
         self.monster = self.board.monster_at(start)
+        self.move_costs = self.board.get_move_costs(self.monster.terrain_type)
         # creating set with tuple doesn't work, add it separately
         self.accessible_positions = set()
         self.accessible_positions.add(start)
@@ -206,7 +225,7 @@ class MatrixProcessor:
         # if tile has enemies adjacent, you cannot move from it, unless
         # this is the tile the moving monster starts on
         for enemy in adjacent_enemies:
-            self.matrix.enemies.add(enemy)
+            self.matrix.enemies[enemy] = None
         if adjacent_enemies and self.monster.pos != self.pos:
             self.cannot_move_from_pos = True
             self._highlight_tiles_with_enemies(adjacent_enemies)
@@ -236,15 +255,14 @@ class MatrixProcessor:
             self._push_tile_at(adj_pos)
 
     def _tile_is_not_passable(self, pos):
-        tile_monster = self.board.monster_at(pos)
+        tile_monster = self.board.monster_at_index(
+            pos[0] * self.board.y_max + pos[1])
         if (tile_monster
                 and tile_monster.is_enemy_of(self.monster.owner)):
             return True
 
     def _get_move_cost_for(self, pos):
-        return DataTables.get_terrain_cost(
-            self.board.terrain_at(pos),
-            self.monster.terrain_type)
+        return self.move_costs[pos[0] * self.board.y_max + pos[1]]
 
     def _move_is_valid_and_better(self, pos):
         # Returns true only if this move is within the move point budget and
@@ -535,8 +553,7 @@ class PathFinder:
         path_cost_difference = (
                 self._get_distance_value(self.pos_from) -
                 self._get_distance_value(self.pos_to))
-        terrain = self.board.terrain_at(self.pos_from)
-        move_cost = DataTables.get_terrain_cost(terrain, self.terrain_type)
+        move_cost = self.board.move_cost_at(self.pos_from, self.terrain_type)
         return path_cost_difference == move_cost
 
     def _next_tile_is_not_blocked(self):
@@ -556,7 +573,8 @@ class PathFinder:
         return True
 
     def _pos_has_adjacent_enemy(self, pos):
-        nearby_monster = self.board.monster_at(pos)
+        nearby_monster = self.board.monster_at_index(
+            pos[0] * self.board.y_max + pos[1])
         return (nearby_monster
                 and nearby_monster.is_enemy_of(self.board.get_current_player()))
 
@@ -585,7 +603,6 @@ class MatrixFactory:
     def __init__(self, board):
         self.matrix = None
         self.processor: FullMatrixProcessor = None
-        self.terrain_cost = DataTables.terrain_cost
         self.board: board.Board = board
 
     def setup_matrix(self, start):
@@ -679,3 +696,193 @@ class TowerSearchMatrixFactory(MatrixFactory):
     #     logging.info('4')
     #     logging.info(self.matrix.get_dist_values())
     #     return self.matrix
+
+
+class DistanceField:
+    """Distance from every pos to the closest of a number of targets
+
+    Made by searching backwards from all targets at once, using the terrain
+    cost for one terrain type, so the values are the same as a forward search
+    from each pos would give. Monsters are ignored. Equally distant targets
+    are decided by the lowest target pos.
+    """
+
+    def __init__(self, board, terrain_type):
+        self.board = board
+        self.terrain_type = terrain_type
+        size = board.x_max * board.y_max
+        self.distances = [UNEXPLORED] * size
+        self.closest_targets = [None] * size
+        self.move_costs = None
+
+    def get_distance_value_at(self, pos):
+        return self.distances[self.board.index_of(pos)]
+
+    def get_closest_target_from(self, pos):
+        """Returns the pos of the closest target, or None if none is reachable
+        """
+        return self.closest_targets[self.board.index_of(pos)]
+
+    def fill_distance_values_from(self, targets):
+        board = self.board
+        self.move_costs = self._get_move_costs()
+        move_costs = self.move_costs
+        distances = self.distances
+        closest_targets = self.closest_targets
+        tiles_to_explore = []
+        for target in targets:
+            index = board.index_of(target)
+            distances[index] = 0
+            closest_targets[index] = target
+            tiles_to_explore.append((0, target, target))
+        heapq.heapify(tiles_to_explore)
+        while tiles_to_explore:
+            dist, target, pos = heapq.heappop(tiles_to_explore)
+            index = board.index_of(pos)
+            if (dist, target) != (distances[index], closest_targets[index]):
+                continue
+            # moving from an adjacent tile to pos costs the terrain at pos
+            move_cost = move_costs[index]
+            if move_cost == 99:
+                continue
+            next_dist = dist + move_cost
+            for adj_pos in board.get_posses_adjacent_to(pos):
+                adj_index = board.index_of(adj_pos)
+                if (closest_targets[adj_index] is None
+                        or (next_dist, target) < (distances[adj_index],
+                                                  closest_targets[adj_index])):
+                    distances[adj_index] = next_dist
+                    closest_targets[adj_index] = target
+                    heapq.heappush(tiles_to_explore,
+                                   (next_dist, target, adj_pos))
+
+    def _get_move_costs(self):
+        # a copy, the board keeps its own grid up to date
+        return self.board.get_move_costs(self.terrain_type)[:]
+
+
+class TowerDistanceField(DistanceField):
+    """Distance field to the towers a player can capture"""
+
+    def __init__(self, board, player, terrain_type):
+        super().__init__(board, terrain_type)
+        self.player = player
+
+    def get_closest_tower_from(self, pos):
+        return self.get_closest_target_from(pos)
+
+    def fill_distance_values(self):
+        towers = self.board.towers.get_capturable_towers_for_player(
+            self.player)
+        self.fill_distance_values_from(towers)
+
+
+class TowerDistanceFieldFactory:
+    """Keeps a tower distance field per player and terrain type
+
+    A field is made again only when terrain or tower ownership has changed,
+    so all monsters of a player share the same search.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.fields = {}
+
+    def get_field_for(self, player, terrain_type) -> TowerDistanceField:
+        key = (player, terrain_type)
+        self.board.update_for_data_tables()
+        versions = (self.board.terrain_version, self.board.towers.version)
+        if key in self.fields:
+            field_versions, field = self.fields[key]
+            if field_versions == versions:
+                return field
+        field = TowerDistanceField(self.board, player, terrain_type)
+        field.fill_distance_values()
+        self.fields[key] = (versions, field)
+        return field
+
+
+class DestinationField(DistanceField):
+    """Flow field towards a single destination, such as an enemy lord
+
+    Gives a shortest path like the simple path from the a star matrix, but
+    any monster with the same terrain type can read its path from it. When
+    several paths are equally short, the two may take different ones.
+    """
+
+    def __init__(self, board, destination, terrain_type):
+        super().__init__(board, terrain_type)
+        self.destination = destination
+
+    def fill_distance_values(self):
+        self.fill_distance_values_from((self.destination,))
+
+    def get_next_step_from(self, pos):
+        """Returns the adjacent pos on a shortest path, None if there is none
+
+        Simple paths are traced back from the destination trying horizontal
+        moves first. Trying the adjacent posses in reverse order gives paths
+        of a similar shape.
+        """
+        board = self.board
+        dist = self.distances[board.index_of(pos)]
+        if dist == 0 or self.closest_targets[board.index_of(pos)] is None:
+            return None
+        for adj_pos in reversed(board.get_posses_adjacent_to(pos)):
+            adj_index = board.index_of(adj_pos)
+            if (self.closest_targets[adj_index] is not None
+                    and self.move_costs[adj_index] != 99
+                    and (self.distances[adj_index]
+                         + self.move_costs[adj_index]) == dist):
+                return adj_pos
+        assert False, f'Could not find next step from {pos} in field'
+
+    def get_path_from(self, pos, move_points) -> Path:
+        """Returns the path from pos to the destination, or None
+
+        The furthest reachable pos is the last pos on the path that costs no
+        more than move_points to get to.
+        """
+        if self.get_closest_target_from(pos) is None:
+            return None
+        start_dist = self.get_distance_value_at(pos)
+        posses = [pos]
+        while posses[-1] != self.destination:
+            posses.append(self.get_next_step_from(posses[-1]))
+        path = Path()
+        for pos_on_path in reversed(posses):
+            path.add_pos(pos_on_path)
+            if (path.furthest_reachable is None
+                    and start_dist - self.get_distance_value_at(pos_on_path)
+                    <= move_points):
+                path.furthest_reachable = pos_on_path
+        return path
+
+
+class DestinationFieldFactory:
+    """Keeps destination fields per destination and terrain type
+
+    Fields stay valid until terrain changes. Only the most recently used
+    fields are kept, since destinations such as lords move around.
+    """
+    MAX_FIELDS = 32
+
+    def __init__(self, board):
+        self.board = board
+        self.fields = {}
+
+    def get_field_for(self, destination, terrain_type) -> DestinationField:
+        key = (destination, terrain_type)
+        self.board.update_for_data_tables()
+        if key in self.fields:
+            terrain_version, field = self.fields.pop(key)
+            if terrain_version == self.board.terrain_version:
+                self.fields[key] = (terrain_version, field)
+                return field
+        field = DestinationField(self.board, destination, terrain_type)
+        field.fill_distance_values()
+        self.fields[key] = (self.board.terrain_version, field)
+        if len(self.fields) > self.MAX_FIELDS:
+            oldest_key = next(iter(self.fields))
+            self.fields.pop(oldest_key)
+        return field
@@ -3,13 +3,15 @@ from src.helper.Misc.constants import AiType
 
 class Monsters:
     def __init__(self):
-        self.monsters = set()
+        # a dict used as a set that keeps the order monsters were added in,
+        # a set would order them by memory address, different in every run
+        self.monsters = {}
 
     def add(self, monster):
-        self.monsters.add(monster)
+        self.monsters[monster] = None
 
     def remove(self, monster):
-        self.monsters.remove(monster)
+        del self.monsters[monster]
 
     def __len__(self):
         return len(self.monsters)
@@ -91,6 +93,9 @@ class PlayerList:
     def remove_player(self, player):
         index = self.players.index(player)
         self.players.pop(index)
+        # players before the current one shift the current one down
+        if index < self.current_index:
+            self.current_index -= 1
         # if this was a current player, then index doesn't need to change
         # unless this was the last player, in that case the max index decreases
         # and the current index should be set to zero
@@ -10,6 +10,38 @@ class Tile:
         return self.terrain == Terrain.TOWER
 
 
+class BoardTile:
+    """Read-only view of a single board position
+
+    The board stores terrain and monsters in flat arrays, this wraps a pos so
+    it can be passed around like a Tile. Values are always read from the
+    board, so the view stays up to date when the board changes.
+    """
+
+    def __init__(self, board, pos):
+        self.board = board
+        self.pos = pos
+
+    @property
+    def terrain(self):
+        return self.board.terrain_at(self.pos)
+
+    @property
+    def monster(self):
+        return self.board.monster_at(self.pos)
+
+    def has_tower(self):
+        return self.terrain == Terrain.TOWER
+
+    def __eq__(self, other):
+        return (isinstance(other, BoardTile)
+                and other.board is self.board
+                and other.pos == self.pos)
+
+    def __hash__(self):
+        return hash(self.pos)
+
+
 class TileModifier:
     def __init__(self, pos, board):
         self.pos = pos
@@ -135,3 +135,58 @@ class AttackFactory:
                                                          terrain_type)
         accuracy = 100 - terrain_defense
         return accuracy
+
+
+class AttackTable:
+    """Damage, hits and accuracy of every attack between two monsters
+
+    Attacks only depend on the type, exp / 30 and terrain of both monsters
+    and on the sun stance, so tables are kept for those keys and shared
+    between all monsters that have them. Unlike attacks, tables don't refer
+    to the monsters. At most MAX_TABLES are kept, the least recently used
+    are dropped first. Tables are made again when the data tables reload.
+    """
+    MAX_TABLES = 4096
+    _tables = {}
+    _data_version = None
+
+    def __init__(self, attacks: AttackCollection):
+        # self.attacks[side][attack_range] = (damage, accuracy, hits)
+        self.attacks = ([], [])
+        for side in range(2):
+            for attack_range in range(2):
+                attack = attacks.get_attack(side, attack_range)
+                self.attacks[side].append(
+                    (attack.damage, attack.accuracy, attack.hits))
+
+    @classmethod
+    def get_for_monsters(cls, monsters, sun_stance) -> 'AttackTable':
+        if cls._data_version != DataTables.version:
+            cls._tables.clear()
+            cls._data_version = DataTables.version
+        key = cls._get_key_for(monsters, sun_stance)
+        table = cls._tables.pop(key, None)
+        if table is None:
+            attacks = AttackFactory().get_all_attacks_between_monsters(
+                monsters, sun_stance)
+            table = cls(attacks)
+            if len(cls._tables) >= cls.MAX_TABLES:
+                del cls._tables[next(iter(cls._tables))]
+        # (re)inserted last, so the first table is the least recently used
+        cls._tables[key] = table
+        return table
+
+    @staticmethod
+    def _get_key_for(monsters, sun_stance):
+        monster_a, monster_b = monsters
+        return (monster_a.stats.id, monster_a.exp // 30, monster_a.terrain,
+                monster_b.stats.id, monster_b.exp // 30, monster_b.terrain,
+                sun_stance)
+
+    def get_attack(self, side, attack_range):
+        """Returns (damage, accuracy, hits)"""
+        return self.attacks[side][attack_range]
+
+    def get_expected_damage(self, side, attack_range):
+        damage, accuracy, hits = self.attacks[side][attack_range]
+        return damage * accuracy * 0.01 * hits
@@ -0,0 +1,86 @@
+import random
+from array import array
+
+from src.components.combat.attack import AttackTable
+from src.components.combat.combatlog import CombatLog
+
+NO_WINNER = -1
+
+
+class BatchCombatResult:
+    """End results of many fights, one entry per fight in every array
+
+    winners holds the side that won or NO_WINNER. Like CombatOutcome the hp
+    is from before any promotion restores it.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.hp_end = (array('H', bytes(2 * size)), array('H', bytes(2 * size)))
+        self.winners = array('b', bytes(size))
+        self.exp = (array('B', bytes(size)), array('B', bytes(size)))
+
+    def get_win_rate(self, side):
+        if not self.size:
+            return 0
+        return self.winners.count(side) / self.size
+
+
+class BatchCombatBuilder:
+    """Plays many fights in one go without building a combat log for each
+
+    Follows the rules of CombatLogBuilder, including its hit rolls, but only
+    keeps the end result of every fight in a BatchCombatResult. Fights are
+    given as pairs of sides, the attacker first, and every side is a
+    (damage, accuracy, hits, hp, level) tuple.
+    """
+    perfect_accuracy = False  # testing purposes
+
+    def __init__(self, rng=random):
+        self._rng = rng
+
+    def build_from_monsters(self, monster_pairs, attack_range,
+                            sun_stance) -> BatchCombatResult:
+        fights = []
+        for monsters in monster_pairs:
+            table = AttackTable.get_for_monsters(monsters, sun_stance)
+            fights.append(tuple(
+                table.get_attack(side, attack_range)
+                + (monsters[side].hp, monsters[side].stats.level)
+                for side in range(2)))
+        return self.build(fights)
+
+    def build(self, fights) -> BatchCombatResult:
+        result = BatchCombatResult(len(fights))
+        for n, (side_0, side_1) in enumerate(fights):
+            hp, winner = self._fight(side_0, side_1)
+            result.hp_end[0][n], result.hp_end[1][n] = hp
+            result.winners[n] = winner
+            if winner == NO_WINNER:
+                result.exp[0][n] = result.exp[1][n] = 1
+            else:
+                loser = 1 - winner
+                levels = (side_0[4], side_1[4])
+                result.exp[winner][n] = CombatLog.exp_table[
+                    levels[winner] - 1][levels[loser] - 1]
+        return result
+
+    def _fight(self, side_0, side_1):
+        damages = (side_0[0], side_1[0])
+        accuracies = (side_0[1], side_1[1])
+        hits = [side_0[2], side_1[2]]
+        hp = [side_0[3], side_1[3]]
+        randrange = self._rng.randrange
+        perfect_accuracy = self.perfect_accuracy
+        side = 0
+        while hits[0] > 0 or hits[1] > 0:
+            if hits[side] > 0:
+                hits[side] -= 1
+                if perfect_accuracy or randrange(100) < accuracies[side]:
+                    target = 1 - side
+                    if damages[side] >= hp[target]:
+                        hp[target] = 0
+                        return hp, side
+                    hp[target] -= damages[side]
+            side = 1 - side
+        return hp, NO_WINNER
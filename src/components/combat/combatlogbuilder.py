@@ -6,7 +6,8 @@ from src.components.combat.combatlog import CombatLog
 class CombatLogBuilder:
     perfect_accuracy = False  # testing purposes
 
-    def __init__(self):
+    def __init__(self, rng=random):
+        self._rng = rng
         self._attacks: AttackCollection = None
         self._attack_range = None
         self._monsters = None
@@ -82,7 +83,7 @@ class CombatLogBuilder:
     def _hit_is_successful(self):
         if self.perfect_accuracy:
             return True
-        hit_roll = random.randint(0, 99)
+        hit_roll = self._rng.randint(0, 99)
         return hit_roll < self.get_attack_for_a().accuracy
 
     def get_attack_for_a(self) -> Attack:
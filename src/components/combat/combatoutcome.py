@@ -0,0 +1,92 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from src.components.combat.attack import AttackCollection, AttackTable
+
+
+class CombatOutcome:
+    """The chance of every way a fight can end
+
+    hp_chances maps the hp both monsters are left with to the chance of the
+    fight ending that way, before any promotion restores hp. A monster left
+    with 0 hp was killed.
+    """
+
+    def __init__(self, hp_chances):
+        self.hp_chances = hp_chances
+
+    def get_kill_chance(self, side):
+        """Chance that the monster on the given side dies"""
+        return sum(chance for hp, chance in self.hp_chances.items()
+                   if hp[side] == 0)
+
+    def get_expected_hp(self, side):
+        return sum(hp[side] * chance for hp, chance in self.hp_chances.items())
+
+
+class CombatOutcomeCalculator:
+    """Works out the exact outcome of a fight instead of rolling for hits
+
+    Follows the rules of CombatLogBuilder: the attacker hits first, then the
+    monsters take turns for as long as either has hits left, and a fatal hit
+    ends the fight. Promotions only happen after the fight, so they don't
+    change how it ends and are left out.
+    """
+
+    def get_outcome(self, attacks: AttackCollection,
+                    attack_range) -> CombatOutcome:
+        sides = []
+        for side in range(2):
+            attack = attacks.get_attack(side, attack_range)
+            sides.append((attack.damage, attack.accuracy, attack.hits,
+                          attack.monster.hp))
+        return CombatOutcome(dict(get_hp_chances(*sides)))
+
+    def get_outcome_from_table(self, table: AttackTable, monsters,
+                               attack_range) -> CombatOutcome:
+        side_0 = table.get_attack(0, attack_range) + (monsters[0].hp,)
+        side_1 = table.get_attack(1, attack_range) + (monsters[1].hp,)
+        return CombatOutcome(dict(get_hp_chances(side_0, side_1)))
+
+
+@lru_cache(maxsize=4096)
+def get_hp_chances(side_0, side_1):
+    """Returns ((hp_0, hp_1), chance) pairs for every way a fight can end
+
+    Sides are (damage, accuracy, hits, hp) tuples, the attacker first. Only
+    these numbers decide a fight, so results are cached on them.
+    """
+    damages = (side_0[0], side_1[0])
+    accuracies = (side_0[1] / 100, side_1[1] / 100)
+    hits = [side_0[2], side_1[2]]
+    ongoing = {(side_0[3], side_1[3]): 1.0}
+    ended = defaultdict(float)
+    side = 0
+    while ongoing and (hits[0] > 0 or hits[1] > 0):
+        if hits[side] > 0:
+            ongoing = _get_chances_after_attack(
+                ongoing, ended, side, damages[side], accuracies[side])
+            hits[side] -= 1
+        side = 1 - side
+    for hp, chance in ongoing.items():
+        ended[hp] += chance
+    return tuple(ended.items())
+
+
+def _get_chances_after_attack(ongoing, ended, side, damage, accuracy):
+    """Fights that end by this attack are added to ended"""
+    target = 1 - side
+    after_attack = defaultdict(float)
+    for hp, chance in ongoing.items():
+        if accuracy < 1:
+            after_attack[hp] += chance * (1 - accuracy)
+        if accuracy <= 0:
+            continue
+        hp_after_hit = list(hp)
+        if damage >= hp[target]:
+            hp_after_hit[target] = 0
+            ended[tuple(hp_after_hit)] += chance * accuracy
+        else:
+            hp_after_hit[target] -= damage
+            after_attack[tuple(hp_after_hit)] += chance * accuracy
+    return after_attack
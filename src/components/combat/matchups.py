@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from array import array
+
+from src.components.board.monster import Monster
+from src.components.board.players import Player
+from src.components.combat.attack import AttackFactory
+from src.components.combat.combatlog import CombatLog
+from src.components.combat.combatoutcome import CombatOutcomeCalculator
+from src.helper.Misc.constants import CACHE_DIRECTORY, Terrain, DayTime, \
+    Range, TERRAIN_COUNT
+from src.helper.Misc.datatables import DataTables, stats_csv_location, \
+    terrain_defense_csv_location
+
+TERRAINS = TERRAIN_COUNT
+SUN_STANCES = DayTime.NIGHT + 1
+RANGES = Range.LONG + 1
+
+
+class MatchupMatrix:
+    """How every monster type does when it attacks every other monster type
+
+    For each attacker, defender, range, terrain and sun stance it holds the
+    expected damage of the attacker's attack, the chance the defender dies
+    and the exp the attacker can expect. Both monsters are taken to be fresh
+    (full hp, no exp) and to stand on the given terrain.
+
+    The matrix is computed once and kept in a file in the cache, which
+    is memory mapped so every lookup is a single index. The file is made
+    again when stats.csv or defense.csv changed since it was written.
+    """
+    EXPECTED_DAMAGE, KILL_CHANCE, EXPECTED_EXP = range(3)
+    VALUES = 3
+    cache_location = f'{CACHE_DIRECTORY}matchups.bin'
+    _HEADER = struct.Struct('<4s20sH')  # magic, digest of the data, monsters
+    _MAGIC = b'MMX1'
+
+    def __init__(self, path=None):
+        self.path = path or self.cache_location
+        DataTables.ensure_loaded()
+        self.monsters = len(DataTables.monster_stats)
+        self._file = None
+        self._mmap = None
+        self.values = None
+        if not self._open():
+            # about 17 seconds for all monster types, so say what is going on
+            logging.warning(
+                f'building the matchup matrix for {self.monsters} monster '
+                f'types, this takes a while. Build it ahead of time with: '
+                f'python -m src.components.combat.matchups')
+            MatchupMatrixBuilder().write(self.path)
+            assert self._open()
+
+    def get_values(self, attacker_id, defender_id, attack_range, terrain,
+                   sun_stance):
+        """Returns (expected damage, kill chance, expected exp)"""
+        index = self._get_index(
+            attacker_id, defender_id, attack_range, terrain, sun_stance)
+        return tuple(self.values[index:index + self.VALUES])
+
+    def get_value(self, attacker_id, defender_id, attack_range, terrain,
+                  sun_stance, value):
+        return self.values[self._get_index(
+            attacker_id, defender_id, attack_range, terrain, sun_stance)
+            + value]
+
+    def _get_index(self, attacker_id, defender_id, attack_range, terrain,
+                   sun_stance):
+        index = attacker_id * self.monsters + defender_id
+        index = (index * RANGES + attack_range) * TERRAINS + terrain
+        return (index * SUN_STANCES + sun_stance) * self.VALUES
+
+    def close(self):
+        if self._mmap:
+            self.values.release()
+            self._mmap.close()
+            self._file.close()
+        self._file = self._mmap = self.values = None
+
+    def _open(self):
+        """Maps the file if it is up to date"""
+        if not os.path.exists(self.path):
+            return False
+        self._file = open(self.path, 'rb')
+        header = self._file.read(self._HEADER.size)
+        size = self._HEADER.size + self.get_matrix_size(self.monsters) * 4
+        if (header != self.make_header(self.monsters)
+                or os.fstat(self._file.fileno()).st_size != size):
+            logging.info(f'matchup matrix {self.path} is out of date')
+            self._file.close()
+            self._file = None
+            return False
+        self._mmap = mmap.mmap(
+            self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.values = memoryview(self._mmap)[self._HEADER.size:].cast('f')
+        return True
+
+    @classmethod
+    def make_header(cls, monsters):
+        digest = hashlib.sha1()
+        for location in (stats_csv_location, terrain_defense_csv_location):
+            with open(location, 'rb') as fd:
+                digest.update(fd.read())
+        return cls._HEADER.pack(cls._MAGIC, digest.digest(), monsters)
+
+    @classmethod
+    def get_matrix_size(cls, monsters):
+        return (monsters * monsters * RANGES * TERRAINS * SUN_STANCES
+                * cls.VALUES)
+
+
+class MatchupMatrixBuilder:
+    """Computes the matchup matrix from the data tables and writes it"""
+
+    def __init__(self):
+        DataTables.ensure_loaded()
+        self.monster_stats = DataTables.monster_stats
+        self._calculator = CombatOutcomeCalculator()
+
+    def write(self, path):
+        values = self.build()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # written aside and moved, so a reader never maps half a file
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as fd:
+            fd.write(MatchupMatrix.make_header(len(self.monster_stats)))
+            values.tofile(fd)
+        os.replace(temp_path, path)
+        logging.info(f'matchup matrix written to {path}')
+
+    def build(self) -> array:
+        attackers = self._make_monsters(Player(0))
+        defenders = self._make_monsters(Player(1))
+        values = array('f')
+        for attacker in attackers:
+            for defender in defenders:
+                for attack_range in range(RANGES):
+                    for terrain in range(TERRAINS):
+                        attacker.terrain = defender.terrain = terrain
+                        for sun_stance in range(SUN_STANCES):
+                            values.extend(self._get_values(
+                                (attacker, defender), attack_range,
+                                sun_stance))
+        return values
+
+    def _make_monsters(self, player):
+        return [Monster(stats.id, (0, 0), player, Terrain.GRASS)
+                for stats in self.monster_stats]
+
+    def _get_values(self, monsters, attack_range, sun_stance):
+        attacks = AttackFactory().get_attacks_between_monsters(
+            monsters, attack_range, sun_stance)
+        outcome = self._calculator.get_outcome(attacks, attack_range)
+        kill_chance = outcome.get_kill_chance(1)
+        no_kill_chance = 1 - kill_chance - outcome.get_kill_chance(0)
+        winner_exp = CombatLog.exp_table[monsters[0].stats.level - 1][
+            monsters[1].stats.level - 1]
+        return (attacks.get_attack(0, attack_range).get_expected_damage(),
+                kill_chance,
+                kill_chance * winner_exp + no_kill_chance)
+
+
+if __name__ == '__main__':
+    MatchupMatrixBuilder().write(MatchupMatrix.cache_location)
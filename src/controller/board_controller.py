@@ -11,11 +11,13 @@ from src.abstract.view import View
 from src.abstract.window import Window
 from src.controller.yesno_controller import YesNoWindow
 from src.components.board.brain import PlayerIdleBrain, PlayerDefaultBrain
+from src.components.combat.combatlogbuilder import CombatLogBuilder
 from src.controller.combat_controller import CombatWindow
 from src.controller.minimap_controller import MinimapController
 from src.controller.precombat_controller import PreCombatWindow
 from src.controller.sidebar_controller import Sidebar
 from src.controller.summon_controller import SummonWindow
+from src.controller.threaded_ai_controller import ThreadedAiController
 from src.controller.tile_editor_controller import TileEditorWindow
 from src.controller.towercapture_controller import TowerCaptureWindow
 from src.helper.Misc.constants import Color, AiType
@@ -92,6 +94,9 @@ class BoardController(Window):
         self.end_of_turn_window.hide()
 
         # AI stuff
+        self.threaded_ai: ThreadedAiController = None
+        if Options.threaded_ai:
+            self.threaded_ai = ThreadedAiController(self)
         self.create_brains()
 
     def append_ai_callback(self):
@@ -114,7 +119,7 @@ class BoardController(Window):
         self.add_brain_for_player(brain_class, player)
 
     def add_brain_for_player(self, brain_class, player):
-        self.brains[player] = brain_class(self, player)
+        self.brains[player] = brain_class(self.threaded_ai or self, player)
 
     def handle_mouseclick(self):
         if self.is_ai_controlled:
@@ -168,9 +173,7 @@ class BoardController(Window):
     def _handle_key_k(self):
         """For now use this to print terrain to stdout"""
         terrain = [self.model.board.x_max, self.model.board.y_max]
-        for col in self.model.board.tiles:
-            for tile in col:
-                terrain.append(tile.terrain)
+        terrain.extend(self.model.board.terrain)
         print(terrain)
 
     def _handle_arrow_key(self, key):
@@ -194,9 +197,30 @@ class BoardController(Window):
         The event should also include another call to this method if the AI's
         turn is not over yet.
         """
+        if self.threaded_ai:
+            if not self.threaded_ai.is_planning():
+                self.threaded_ai.start_action(self._get_current_brain())
+            if not self.threaded_ai.apply_calls():
+                # check again next tick
+                return 1
+        else:
+            self._get_current_brain().do_action()
+        if self._is_skipping_animations():
+            # one action per tick, or a whole turn would play in one go
+            return -1
+
+    def _is_skipping_animations(self):
+        """Computer turns can skip to the result of their actions
+
+        The model changes just like it does with animations, only the board
+        view is not redrawn until the end of the turn.
+        """
+        return self.is_ai_controlled and Options.skip_ai_animations
+
+    def _get_current_brain(self):
         brain = self._get_current_player_brain()
         assert brain, 'Tried to handle ai action for human'
-        brain.do_action()
+        return brain
 
     def _get_current_player_brain(self):
         player = self.model.get_current_player()
@@ -240,6 +264,8 @@ class BoardController(Window):
         """
         assert monster
         assert path
+        if self._is_skipping_animations():
+            return
         events = self.view.get_movement_events(monster, path)
         for event in events:
             self.append_event(event)
@@ -247,6 +273,8 @@ class BoardController(Window):
 
     def _handle_tower_capture(self, pos):
         self.model.capture_tower_at(pos)
+        if self._is_skipping_animations():
+            return
         capture_event = self.tower_capture_window.show_capture
         freeze_callback = self.freeze_events
         self.append_callback(capture_event)
@@ -262,7 +290,13 @@ class BoardController(Window):
 
     def handle_attack_order(self, monsters, attack_range):
         attacks = self.model.get_short_and_long_attacks(monsters)
-        self.combat_window.on_combat(attacks, attack_range)
+        if self._is_skipping_animations():
+            combat_log = CombatLogBuilder(self.model.random.combat) \
+                .build_from_attacks(attacks, attack_range)
+            self.handle_combat_end(combat_log)
+            return
+        self.combat_window.on_combat(attacks, attack_range,
+                                     self.model.random.combat)
         attacker = attacks.get_attack(0, attack_range).monster
         defender = attacks.get_attack(1, attack_range).monster
         logging.info(f'{attacker} is attacking monster {defender}')
@@ -282,6 +316,8 @@ class BoardController(Window):
 
     def handle_summon_monster(self, monster_type, pos):
         summoned_monster = self.model.summon_monster_at(monster_type, pos)
+        if self._is_skipping_animations():
+            return summoned_monster
         if self.is_ai_controlled:
             self.view.center_camera_on(pos)
         if summoned_monster:
@@ -291,6 +327,7 @@ class BoardController(Window):
         return summoned_monster
 
     def handle_end_of_turn(self):
+        skipped_animations = self._is_skipping_animations()
         self.selection_handler.unselect_current_monster()
         self.selection_handler.unselect_enemy()
         self.model.on_end_turn()
@@ -299,10 +336,16 @@ class BoardController(Window):
             current_player,
             self.model.sun_stance.value)
         lord = self.model.board.get_lord_of(current_player)
+        # also redraws the board and its sprites, after skipped animations
         self.view.center_camera_on(lord.pos)
+        if skipped_animations:
+            self.minimap_window.update_view()
         self.is_ai_controlled = current_player.ai_type != AiType.human
         if self.is_ai_controlled:
+            self.publisher.ticks_per_frame = Options.fast_forward_ticks
             self.append_ai_callback()
+        else:
+            self.publisher.ticks_per_frame = 1
         self.status_bar.update_stats()
 
 
@@ -1,4 +1,5 @@
 import logging
+import random
 
 from pygame import Surface
 
@@ -21,12 +22,12 @@ class CombatWindow(Window):
         self.hide()
         self.active = False
 
-    def on_combat(self, attacks, attack_range):
+    def on_combat(self, attacks, attack_range, rng=random):
         self.show()
         logging.info('Showing combat')
         assert not self.active, 'Combat window is already in use!'
         self.active = True
-        combat = CombatLogBuilder()
+        combat = CombatLogBuilder(rng)
         self.combat_log = combat.build_from_attacks(attacks, attack_range)
 
         draw_screen_event = EventCallback(self.view.draw_screen, attacks)
@@ -0,0 +1,72 @@
+import logging
+
+from src.components.board.brain import PlayerIdleBrain, PlayerDefaultBrain
+from src.components.combat.combatlogbuilder import CombatLogBuilder
+from src.helper.Misc.constants import AiType
+from src.model.board_model import BoardModel
+
+
+class HeadlessBoardController:
+    """Lets the brains play on a board model without any views or events
+
+    Offers the same entry points to the brains as the board controller, but
+    every action is applied to the model right away instead of being followed
+    by events that animate it. Every player gets a brain, human players play
+    as the default AI.
+
+    The brains ask for their next action with append_ai_callback, this only
+    marks that an action is pending. Whoever runs the game calls
+    do_ai_action for as long as that is the case.
+    """
+
+    def __init__(self, model: BoardModel):
+        self.model = model
+        self.brains = {}
+        self.ai_action_pending = False
+        self.create_brains()
+
+    def create_brains(self):
+        for player in self.model.players:
+            self._create_brain(player)
+
+    def _create_brain(self, player):
+        if player.ai_type == AiType.idle:
+            brain_class = PlayerIdleBrain
+        else:
+            brain_class = PlayerDefaultBrain
+        self.add_brain_for_player(brain_class, player)
+
+    def add_brain_for_player(self, brain_class, player):
+        self.brains[player] = brain_class(self, player)
+
+    def append_ai_callback(self):
+        self.ai_action_pending = True
+
+    def do_ai_action(self):
+        self.ai_action_pending = False
+        brain = self.brains[self.model.get_current_player()]
+        brain.do_action()
+
+    def handle_move_monster(self, monster, path):
+        logging.info(f'Moving monster {monster}')
+        pos = path[-1]
+        if monster.pos != pos:
+            assert self.model.board.monster_at(pos) is None, (
+                f'Destination {pos} is occupied by '
+                f'{self.model.board.monster_at(pos)}')
+        self.model.move_monster_to(monster, pos)
+        if self.model.has_capturable_tower_at(pos):
+            self.model.capture_tower_at(pos)
+
+    def handle_attack_order(self, monsters, attack_range):
+        attacks = self.model.get_short_and_long_attacks(monsters)
+        combat_log = CombatLogBuilder(
+            self.model.random.combat).build_from_attacks(attacks, attack_range)
+        self.model.process_combat_log(combat_log)
+
+    def handle_summon_monster(self, monster_type, pos):
+        return self.model.summon_monster_at(monster_type, pos)
+
+    def handle_end_of_turn(self):
+        self.model.on_end_turn()
+        self.append_ai_callback()
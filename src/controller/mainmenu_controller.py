@@ -234,6 +234,7 @@ class MapSelectionWindow(Window):
     def fetch_maps(self):
         mapnames = os.listdir(MAP_DIRECTORY)
         mapnames.append('test')  # fake map name that makes test map
+        mapnames.append('generated')  # fake map name that generates a map
         self.list_maps(mapnames)
 
     def list_maps(self, mapnames):
@@ -1,4 +1,4 @@
-from src.components.combat.attack import AttackCollection
+from src.components.combat.attack import AttackTable
 from src.abstract.view import View
 from src.abstract.window import Window
 from src.components.button import Button
@@ -14,7 +14,8 @@ class PreCombatWindow(Window):
         self.board_model: board_controller.BoardModel = board_model
         self.combat_window: CombatWindow = combat_window
 
-        self.attacks: AttackCollection = None
+        self.monsters = None
+        self.attacks: AttackTable = None
         self.view: PreCombatView = self.add_view(PreCombatView)
         self.short_range_button: AttackButton = self.attach_controller(
             AttackButton(
@@ -31,28 +32,26 @@ class PreCombatWindow(Window):
         self.hide()
 
     def handle_attack_choice(self, attack_range):
-        monsters = (self.attacks.get_attack(0, attack_range).monster,
-                    self.attacks.get_attack(1, attack_range).monster)
-        self.parent.handle_attack_order(monsters, attack_range)
+        self.parent.handle_attack_order(self.monsters, attack_range)
         self.hide()
 
     def handle_mouseclick(self):
         self.hide()
 
     def set_attackers(self, combat_monsters):
+        """Only shows the numbers, so the cached attack table is enough"""
         assert len(combat_monsters) == 2
-        attacks = self.board_model.get_short_and_long_attacks(combat_monsters)
-        self._set_and_display_attacks(attacks)
+        attacks = self.board_model.get_attack_table(combat_monsters)
+        self._set_and_display_attacks(combat_monsters, attacks)
 
-    def _set_and_display_attacks(self, attacks):
+    def _set_and_display_attacks(self, monsters, attacks):
         if not self.view:
             return
+        self.monsters = monsters
         self.attacks = attacks
-        side_left_attacks = attacks.get_all_ranges(0)
-        side_right_attacks = attacks.get_all_ranges(1)
-        self.short_range_button.set_stats(side_left_attacks)
-        self.long_range_button.set_stats(side_right_attacks)
-        self.view.display_attacks(attacks)
+        self.short_range_button.set_stats(attacks, 0)
+        self.long_range_button.set_stats(attacks, 1)
+        self.view.display_monsters(monsters)
         self.view.queue_for_background_update()
 
 
@@ -61,8 +60,8 @@ class AttackButton(Button):
         super().__init__(x, y, width, height, info, callback, arguments)
         self.view = self.add_view(AttackButtonView)
 
-    def set_stats(self, attacks):
-        self.view.set_stats(attacks)
+    def set_stats(self, attacks, side):
+        self.view.set_stats(attacks, side)
 
 
 class PreCombatView(View):
@@ -87,11 +86,9 @@ class PreCombatView(View):
                 f'monster_{n}', size=20, offset=(x_base, close_range_y - 25),
                 max_width=100)
 
-    def display_attacks(self, attacks):
+    def display_monsters(self, monsters):
         for n in range(2):
-            close_attack = attacks.get_attack(n, 0)
-            monster_ = close_attack.monster
-            self.monsters[n].set_text(f'{monster_.name}')
+            self.monsters[n].set_text(f'{monsters[n].name}')
 
 
 class AttackButtonView(View):
@@ -108,9 +105,9 @@ class AttackButtonView(View):
                 f'accuracy_{n}', size=24, offset=(x_base, 25))
         self.queue_for_background_update()
 
-    def set_stats(self, attacks):
-        for n in attacks:
-            attack = attacks[n]
-            self.damage[n].set_text(f'{attack.damage} - {attack.hits}')
-            self.accuracy[n].set_text(f'{attack.accuracy}')
+    def set_stats(self, attacks: AttackTable, side):
+        for n in range(2):
+            damage, accuracy, hits = attacks.get_attack(side, n)
+            self.damage[n].set_text(f'{damage} - {hits}')
+            self.accuracy[n].set_text(f'{accuracy}')
         self.queue_for_background_update()
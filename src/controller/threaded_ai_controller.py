@@ -0,0 +1,107 @@
+import logging
+import queue
+import threading
+
+from src.model.board_model import BoardModel
+
+
+class ThreadedAiController:
+    """Lets the brains plan on a worker thread, so the game keeps running
+
+    The brains get this in place of the board controller. An action is
+    started with start_action, which runs brain.do_action on a worker
+    thread. The path finding and attack scoring happen there, while the
+    main thread keeps handling input and drawing frames.
+
+    Every entry point a brain calls is handed to the main thread, and the
+    worker waits for the result. The main thread picks these calls up with
+    apply_calls, and makes them on the board controller as if the brain had
+    called it. The model is only changed by those calls, while the worker
+    waits for them, so the brain plans on a model that does not change under
+    it, and the actions are the same as without a thread.
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.model: BoardModel = controller.model
+        self.calls = queue.Queue()
+        self.results = queue.Queue()
+        self.thread: threading.Thread = None
+
+    def is_planning(self):
+        return self.thread is not None
+
+    def start_action(self, brain):
+        assert not self.is_planning(), 'Brain is already planning an action'
+        # daemon, so a worker waiting for the main thread doesn't keep the
+        # game from quitting
+        self.thread = threading.Thread(
+            target=self._do_action, args=(brain,), name='ai action',
+            daemon=True)
+        self.thread.start()
+
+    def _do_action(self, brain):
+        try:
+            brain.do_action()
+        except Exception as exception:
+            logging.exception('AI action failed')
+            self.calls.put((None, exception))
+        else:
+            self.calls.put((None, None))
+
+    def apply_calls(self):
+        """Makes the calls the brain asked for so far, on the main thread
+
+        Returns True when the action is done, raising the error of the
+        worker if it failed.
+        """
+        while True:
+            try:
+                name, args = self.calls.get_nowait()
+            except queue.Empty:
+                return False
+            if name is None:
+                self.thread.join()
+                self.thread = None
+                if args:
+                    raise args
+                return True
+            try:
+                result = getattr(self.controller, name)(*args)
+            except Exception as exception:
+                self._stop_worker(exception)
+                raise
+            self.results.put((result, None))
+
+    def _stop_worker(self, exception):
+        """Lets the waiting worker raise the error of a call, and ends it"""
+        self.results.put((None, exception))
+        self.thread.join()
+        self.thread = None
+        # the worker reported its end, which the main thread raises already
+        while not self.calls.empty():
+            self.calls.get_nowait()
+
+    def _call_on_main_thread(self, name, *args):
+        self.calls.put((name, args))
+        result, exception = self.results.get()
+        if exception:
+            raise exception
+        return result
+
+    def append_ai_callback(self):
+        self._call_on_main_thread('append_ai_callback')
+
+    def handle_move_monster(self, monster, path):
+        self._call_on_main_thread('handle_move_monster', monster, path)
+
+    def handle_attack_order(self, monsters, attack_range):
+        self._call_on_main_thread('handle_attack_order', monsters,
+                                  attack_range)
+
+    def handle_summon_monster(self, monster_type, pos):
+        return self._call_on_main_thread('handle_summon_monster',
+                                         monster_type, pos)
+
+    def handle_end_of_turn(self):
+        self._call_on_main_thread('handle_end_of_turn')
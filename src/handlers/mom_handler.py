@@ -2,11 +2,13 @@ from src.abstract.controller import ControllerInfo, ControllerConfig
 from src.abstract.game_handler import GameHandler
 from src.controller.mom_controller import MomController
 from src.handlers.mom_display import MomDisplay
+from src.helper.Misc.datatables import DataTables
 
 
 class MomHandler(GameHandler):
     def __init__(self):
         super().__init__(1125, 600)
+        DataTables.ensure_loaded()
         config = ControllerConfig()
         info = ControllerInfo(config, self.publisher)
         self.top_controller = MomController(info, self.width, self.height)
@@ -0,0 +1,81 @@
+import sys
+import time
+
+from src.components.board.board import MapOptions
+from src.controller.headless_controller import HeadlessBoardController
+from src.helper.Misc.constants import AiType
+from src.helper.profiler import Profiler
+from src.model.board_model import BoardModel
+
+
+class SimulationResult:
+    def __init__(self, turns, winners, wall_time, seed):
+        self.turns = turns
+        # ids of the players left when the game ended, empty if it didn't
+        self.winners = winners
+        self.wall_time = wall_time
+        # play the game again by setting this as the seed of the map options
+        self.seed = seed
+
+    def is_finished(self):
+        return bool(self.winners)
+
+    def __repr__(self):
+        if self.is_finished():
+            outcome = f'won by player(s) {", ".join(map(str, self.winners))}'
+        else:
+            outcome = 'not finished'
+        return (f'{outcome} after {self.turns} turns '
+                f'in {self.wall_time:.2f}s')
+
+
+class SimulationHandler:
+    """Plays a game between computer players without pygame, as fast as it can
+
+    Unlike the game handler there is no display, input or frame rate, the
+    brains act directly on the model through a headless board controller.
+    Human players are replaced by the default AI. The game stops when the
+    model says it is over, or after max_turns turns (one turn per player).
+    """
+    MAX_TURNS = 1000
+
+    def __init__(self, mapoptions: MapOptions = None, max_turns=MAX_TURNS):
+        self.max_turns = max_turns
+        self.model = BoardModel(mapoptions)
+        self._replace_human_players()
+        self.controller = HeadlessBoardController(self.model)
+
+    def _replace_human_players(self):
+        for player in self.model.players:
+            if player.ai_type == AiType.human:
+                player.ai_type = AiType.default
+        self.model.ai_only_match = True
+
+    def run(self) -> SimulationResult:
+        start_time = time.perf_counter()
+        self.controller.append_ai_callback()
+        while self.is_running():
+            self.controller.do_ai_action()
+        wall_time = time.perf_counter() - start_time
+        return SimulationResult(self.model.turn, self._get_winners(),
+                                wall_time, self.model.random.seed)
+
+    def is_running(self):
+        return (self.controller.ai_action_pending
+                and not self.model.game_over
+                and self.model.turn < self.max_turns)
+
+    def _get_winners(self):
+        if not self.model.game_over:
+            return ()
+        return tuple(player.id_ for player in self.model.players)
+
+
+if __name__ == '__main__':
+    # python -m src.handlers.simulation_handler [profile.json|profile.csv]
+    if len(sys.argv) > 1:
+        with Profiler() as profiler:
+            print(SimulationHandler().run())
+        profiler.write(sys.argv[1])
+    else:
+        print(SimulationHandler().run())
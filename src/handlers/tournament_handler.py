@@ -0,0 +1,181 @@
+import itertools
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+
+from src.components.board.board import MapOptions
+from src.handlers.simulation_handler import SimulationHandler, \
+    SimulationResult
+from src.helper.Misc.constants import AiType, MonsterType
+from src.helper.Misc.datatables import DataTables
+
+
+class MatchSetup:
+    """Everything needed to play the same match again
+
+    Lord types, ai types and teams have one entry per player. Simulations
+    play human players with the default AI, so they are recorded as such.
+    """
+
+    def __init__(self, seed, mapname, lord_types, ai_types, teams=None,
+                 max_turns=SimulationHandler.MAX_TURNS):
+        assert len(lord_types) == len(ai_types)
+        self.seed = seed
+        self.mapname = mapname
+        self.lord_types = tuple(lord_types)
+        self.ai_types = tuple(AiType.default if ai_type == AiType.human
+                              else ai_type for ai_type in ai_types)
+        if teams is None:
+            teams = (0,) * len(lord_types)
+        self.teams = tuple(teams)
+        self.max_turns = max_turns
+
+    def get_mapoptions(self) -> MapOptions:
+        mapoptions = MapOptions()
+        mapoptions.mapname = self.mapname
+        mapoptions.seed = self.seed
+        mapoptions.set_number_of_players(len(self.lord_types))
+        for n in range(len(self.lord_types)):
+            mapoptions.lord_types[n] = self.lord_types[n]
+            mapoptions.ai_types[n] = self.ai_types[n]
+            mapoptions.teams[n] = self.teams[n]
+        return mapoptions
+
+    def __repr__(self):
+        return (f'{self.mapname} seed {self.seed}, lords {self.lord_types}, '
+                f'ai {self.ai_types}, teams {self.teams}')
+
+
+class MatchResult:
+    def __init__(self, setup: MatchSetup, result: SimulationResult):
+        self.setup = setup
+        self.result = result
+
+    def get_winning_lord_types(self):
+        return [self.setup.lord_types[id_] for id_ in self.result.winners]
+
+    def get_winning_ai_types(self):
+        return [self.setup.ai_types[id_] for id_ in self.result.winners]
+
+
+def get_match_setups(seeds, mapnames=('test',), lord_lineups=None,
+                     ai_lineups=None, team_setups=(None,),
+                     max_turns=SimulationHandler.MAX_TURNS):
+    """Returns a setup for every combination of the options given
+
+    Lineups have one entry per player. By default four lords play against
+    each other, all using the default AI, with every lord starting once at
+    every start position.
+    """
+    if lord_lineups is None:
+        lords = tuple(range(MonsterType.DAIMYOU, MonsterType.DAIMYOU + 4))
+        lord_lineups = [lords[n:] + lords[:n] for n in range(len(lords))]
+    if ai_lineups is None:
+        ai_lineups = ((AiType.default,) * 4,)
+    setups = []
+    for mapname, lord_types, ai_types, teams, seed in itertools.product(
+            mapnames, lord_lineups, ai_lineups, team_setups, seeds):
+        setups.append(MatchSetup(seed, mapname, lord_types, ai_types, teams,
+                                 max_turns))
+    return setups
+
+
+def _init_worker():
+    # every worker parses the tables once, not once per match
+    DataTables.ensure_loaded()
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def play_match(setup: MatchSetup) -> MatchResult:
+    simulation = SimulationHandler(setup.get_mapoptions(), setup.max_turns)
+    return MatchResult(setup, simulation.run())
+
+
+class TournamentResults:
+    ai_type_names = ('human', 'idle', 'default', 'scout', 'attacker',
+                     'defender')
+
+    def __init__(self, match_results, wall_time):
+        self.match_results = match_results
+        self.wall_time = wall_time
+
+    def get_win_rates_per_lord(self):
+        return self._get_win_rates(
+            lambda setup: setup.lord_types,
+            MatchResult.get_winning_lord_types)
+
+    def get_win_rates_per_ai_type(self):
+        return self._get_win_rates(
+            lambda setup: setup.ai_types,
+            MatchResult.get_winning_ai_types)
+
+    def _get_win_rates(self, get_participants, get_winners):
+        """Share of the matches each participant took part in that it won
+
+        A participant is counted once per match, so with two default AI
+        players in a match a win by either is one win for the default AI.
+        """
+        games = defaultdict(int)
+        wins = defaultdict(int)
+        for match_result in self.match_results:
+            for participant in set(get_participants(match_result.setup)):
+                games[participant] += 1
+            for winner in set(get_winners(match_result)):
+                wins[winner] += 1
+        return {participant: wins[participant] / games[participant]
+                for participant in games}
+
+    def get_finished_count(self):
+        return sum(match_result.result.is_finished()
+                   for match_result in self.match_results)
+
+    def get_match_times(self):
+        return [match_result.result.wall_time
+                for match_result in self.match_results]
+
+    def report(self):
+        lines = [f'{len(self.match_results)} matches in '
+                 f'{self.wall_time:.1f}s, '
+                 f'{self.get_finished_count()} finished']
+        if not self.match_results:
+            return '\n'.join(lines)
+        match_times = self.get_match_times()
+        lines += [f'match time: mean {sum(match_times) / len(match_times):.2f}s'
+                  f', max {max(match_times):.2f}s',
+                  'win rate per lord:']
+        for lord_type, rate in sorted(self.get_win_rates_per_lord().items()):
+            name = DataTables.get_monster_stats(lord_type).name
+            lines.append(f'  {name:12} {rate:6.1%}')
+        lines.append('win rate per ai type:')
+        for ai_type, rate in sorted(self.get_win_rates_per_ai_type().items()):
+            name = self.ai_type_names[ai_type]
+            lines.append(f'  {name:12} {rate:6.1%}')
+        return '\n'.join(lines)
+
+
+class TournamentHandler:
+    """Plays many simulated matches spread over a pool of processes
+
+    Every match is seeded with its own seed, so any of them can be played
+    again on its own with play_match.
+    """
+
+    def __init__(self, setups, processes=None):
+        self.setups = setups
+        self.processes = processes
+
+    def run(self) -> TournamentResults:
+        # the report names the lords, so the tables are needed here as well
+        DataTables.ensure_loaded()
+        start_time = time.perf_counter()
+        with multiprocessing.Pool(self.processes,
+                                  initializer=_init_worker) as pool:
+            match_results = list(pool.imap(play_match, self.setups))
+        wall_time = time.perf_counter() - start_time
+        return TournamentResults(match_results, wall_time)
+
+
+if __name__ == '__main__':
+    results = TournamentHandler(get_match_setups(range(8))).run()
+    print(results.report())
@@ -5,6 +5,22 @@ DIR_OF_THIS_FILE = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR_END = DIR_OF_THIS_FILE.find('src')
 ROOT = DIR_OF_THIS_FILE[0:ROOT_DIR_END]
 MAP_DIRECTORY = f'{ROOT}src/data/maps/'
+# derived data, made again when missing or out of date. It is kept in the
+# user's cache directory, so the game can be installed read-only, unless
+# MOM_CACHE_DIRECTORY says where to keep it
+CACHE_DIRECTORY = os.path.join(
+    os.environ.get('MOM_CACHE_DIRECTORY')
+    or os.path.join(os.environ.get('XDG_CACHE_HOME')
+                    or os.path.expanduser('~/.cache'), 'master-of-monsters'),
+    '')
+# logs written on request, such as the frame log. Kept in the user's state
+# directory for the same reason, unless MOM_LOG_DIRECTORY says where
+LOG_DIRECTORY = os.path.join(
+    os.environ.get('MOM_LOG_DIRECTORY')
+    or os.path.join(os.environ.get('XDG_STATE_HOME')
+                    or os.path.expanduser('~/.local/state'),
+                    'master-of-monsters', 'logs'),
+    '')
 
 print(f'Root dir: {ROOT}')
 
@@ -1,10 +1,15 @@
+import hashlib
 import logging
+import os
+import pickle
 
-from src.helper.Misc.constants import ROOT, SUMMONER_COUNT, MonsterType
+from src.helper.Misc.constants import ROOT, SUMMONER_COUNT, MonsterType, \
+    CACHE_DIRECTORY
 
 stats_csv_location = f'{ROOT}/src/data/monsters/stats.csv'
 terrain_cost_csv_location = f'{ROOT}/src/data/terrain/cost.csv'
 terrain_defense_csv_location = f'{ROOT}/src/data/terrain/defense.csv'
+table_cache_location = f'{CACHE_DIRECTORY}tables.pickle'
 
 
 class TableLoader:
@@ -93,7 +98,64 @@ class TableLoader:
         return lines
 
 
+class TableCache:
+    """Keeps the parsed tables in a pickle, so the csv files are parsed once
+
+    The pickle holds a checksum of the csv files it was made from and is only
+    used while they are unchanged.
+    """
+    _FORMAT = b'1'  # change when the tables or MonsterStats change shape
+    _TABLES = ('terrain_cost', 'terrain_name', 'terrain_defense',
+               'summon_options', 'monster_stats')
+
+    def __init__(self, tableholder):
+        self.tableholder = tableholder
+        self.checksum = self.get_checksum()
+
+    def load_tables(self):
+        """Returns if the tables could be loaded from the cache"""
+        try:
+            with open(table_cache_location, 'rb') as fd:
+                checksum, tables = pickle.load(fd)
+        except FileNotFoundError:
+            return False
+        except Exception as error:
+            logging.warning(f'unreadable table cache: {error!r}')
+            return False
+        if checksum != self.checksum:
+            return False
+        for name in self._TABLES:
+            setattr(self.tableholder, name, tables[name])
+        return True
+
+    def save_tables(self):
+        tables = {name: getattr(self.tableholder, name)
+                  for name in self._TABLES}
+        # written aside and moved, so a reader never loads half a file
+        temp_location = f'{table_cache_location}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(table_cache_location), exist_ok=True)
+            with open(temp_location, 'wb') as fd:
+                pickle.dump((self.checksum, tables), fd,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_location, table_cache_location)
+        except OSError as error:
+            logging.warning(f'could not write table cache: {error!r}')
+
+    @classmethod
+    def get_checksum(cls):
+        digest = hashlib.sha1(cls._FORMAT)
+        for location in (stats_csv_location, terrain_cost_csv_location,
+                         terrain_defense_csv_location):
+            with open(location, 'rb') as fd:
+                digest.update(fd.read())
+        return digest.digest()
+
+
 class MonsterStats:
+    __slots__ = ('id', 'name', 'alignment', 'level', 'terrain_type',
+                 'move_points', 'max_hp', 'max_exp', 'promotion',
+                 'summon_cost', 'damage', 'hits', 'element', 'resistance')
     move_types = ["M", "SH", "S", "SL", "SF", "OB", "OS", "LB", "LS", "LF",
                   "I2", "I1", "LD", "-"]
     alignments = ["L", "N", "C"]
@@ -159,48 +221,64 @@ class MonsterStats:
 
 
 class DataTables:
+    """The game data, load it once before using any of it
+
+    The getters are plain lookups and don't check if the tables are loaded.
+    ensure_loaded is called where game data first comes in: boards, monsters,
+    BoardModel, the game handler and the tournament.
+    """
     terrain_cost = []
     terrain_name = []
     terrain_defense = []
     summon_options = {}
     monster_stats = []
     loaded = False
+    # increased on every load, so anything derived from the tables can tell
+    # if it is out of date
+    version = 0
 
     @staticmethod
     def load():
-        table_loader = TableLoader(DataTables)
-        table_loader.load_tables()
-        logging.info('data tables loaded')
+        DataTables._clear()
+        table_cache = TableCache(DataTables)
+        if table_cache.load_tables():
+            logging.info('data tables loaded from cache')
+        else:
+            TableLoader(DataTables).load_tables()
+            table_cache.save_tables()
+            logging.info('data tables loaded')
         DataTables.loaded = True
+        DataTables.version += 1
 
     @staticmethod
-    def get_terrain_cost(terrain, movement_type):
+    def ensure_loaded():
         if not DataTables.loaded:
             DataTables.load()
-        assert terrain is not None
-        assert movement_type is not None
+
+    @staticmethod
+    def _clear():
+        DataTables.terrain_cost = []
+        DataTables.terrain_name = []
+        DataTables.terrain_defense = []
+        DataTables.summon_options = {}
+        DataTables.monster_stats = []
+
+    @staticmethod
+    def get_terrain_cost(terrain, movement_type):
         return DataTables.terrain_cost[terrain][movement_type]
 
     @staticmethod
     def get_terrain_defense(terrain, terrain_type):
-        if not DataTables.loaded:
-            DataTables.load()
         return DataTables.terrain_defense[terrain][terrain_type]
 
     @staticmethod
     def get_monster_stats(monster_id) -> MonsterStats:
-        if not DataTables.loaded:
-            DataTables.load()
         return DataTables.monster_stats[monster_id]
 
     @staticmethod
     def get_terrain_name(terrain_id):
-        if not DataTables.loaded:
-            DataTables.load()
         return DataTables.terrain_name[terrain_id]
 
     @staticmethod
     def get_summon_options(summoner_id):
-        if not DataTables.loaded:
-            DataTables.load()
         return DataTables.summon_options[summoner_id]
@@ -1,2 +1,12 @@
 class Options:
     headless = False
+    # compares every generated path matrix with a dijkstra search, slow
+    validate_path_matrices = False
+    # times every frame, shows the times on screen and logs them to a file
+    frame_stats = False
+    # during computer turns: event ticks per rendered frame, and whether to
+    # leave out the animations of moves, combat and tower captures
+    fast_forward_ticks = 1
+    skip_ai_animations = False
+    # computer players plan their actions on a worker thread
+    threaded_ai = False
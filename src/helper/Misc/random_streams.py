@@ -0,0 +1,26 @@
+import random
+
+
+class RandomStreams:
+    """Separate random number generators for the parts of one game
+
+    Combat, healing, AI choices and map generation each draw from their own
+    stream, so one of them drawing more numbers than before doesn't change
+    what the others get. Two games with the same seed play out the same.
+
+    Without a seed one is taken from the random module, so seeding that
+    still makes a game repeatable. The seed is kept to replay the game.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.combat = self.get_stream('combat')
+        self.healing = self.get_stream('healing')
+        self.ai = self.get_stream('ai')
+        self.map = self.get_stream('map')
+
+    def get_stream(self, name) -> random.Random:
+        """Returns a new generator that only depends on the seed and name"""
+        return random.Random(f'{self.seed}/{name}')
@@ -54,6 +54,7 @@ class EventList:
                and not self.frozen and max < 1000):
             self._play_event()
             max += 1
+        self.publisher.played_count += max
         if not self.events:
             self.unsubscribe()
         if max == 1000:
@@ -130,6 +131,11 @@ class Publisher:
         self.to_unsubscribe = set()
         self.to_subscribe = set()
         self.is_reading_events = False
+        # ticks the game handler runs before rendering the next frame
+        self.ticks_per_frame = 1
+        # running totals, for measuring the work done per tick
+        self.polled_count = 0
+        self.played_count = 0
 
     def create_event_list(self, events=None) -> EventList:
         event_list = EventList(events)
@@ -138,6 +144,7 @@ class Publisher:
 
     def tick_events(self):
         self.is_reading_events = True
+        self.polled_count += len(self.events)
         for event in self.events:
             event.poll_events(self.timer)
         self.is_reading_events = False
@@ -155,6 +162,7 @@ class Publisher:
                 self.events.remove(event)
             self.to_unsubscribe.clear()
         if self.to_subscribe:
+            self.polled_count += len(self.to_subscribe)
             for event in self.to_subscribe:
                 self.events.add(event)
                 event.poll_events(self.timer)
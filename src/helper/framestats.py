@@ -0,0 +1,104 @@
+import logging
+import os
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from src.helper.Misc.constants import LOG_DIRECTORY
+
+frame_log_location = f'{LOG_DIRECTORY}frames.log'
+
+
+class CsvLogHandler(RotatingFileHandler):
+    """Starts every log file with the csv header, also after a rollover"""
+
+    def __init__(self, path, header, max_bytes, backups):
+        super().__init__(path, maxBytes=max_bytes, backupCount=backups)
+        self.header = header
+        self._write_header()
+
+    def doRollover(self):
+        super().doRollover()
+        self._write_header()
+
+    def _write_header(self):
+        self.stream.write(self.header + self.terminator)
+        self.flush()
+
+
+class FrameStats:
+    """Keeps the times and counts of the last frames of the game loop
+
+    Every frame adds one row: the seconds spent on each phase of the frame,
+    how many event lists the publisher polled, how many callbacks they
+    played, how many rects were sent to pygame.display.update and how many
+    views were redrawn. The last rows are kept for the overlay, and every
+    row is written as a csv line to a log file that rolls over when it gets
+    large.
+    """
+    PHASES = ('input', 'events', 'blit', 'wait')
+    COUNTS = ('event_lists', 'callbacks', 'rects', 'views')
+    FIELDS = ('frame',) + PHASES + COUNTS
+    HISTORY = 120
+    LOG_BYTES = 1 << 20
+    LOG_BACKUPS = 3
+
+    def __init__(self, log_path=frame_log_location):
+        self.frame = 0
+        self.rows = deque(maxlen=self.HISTORY)
+        self.logger = None
+        if log_path:
+            self._open_log(log_path)
+
+    def _open_log(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = CsvLogHandler(path, ','.join(self.FIELDS),
+                                self.LOG_BYTES, self.LOG_BACKUPS)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        # not registered with logging, so the game's logging is unaffected
+        self.logger = logging.Logger('frame_stats')
+        self.logger.addHandler(handler)
+
+    def add_frame(self, times, counts):
+        """Times are seconds per phase, counts follow COUNTS"""
+        row = (self.frame, *times, *counts)
+        self.rows.append(row)
+        self.frame += 1
+        if self.logger:
+            self.logger.info(
+                f'{row[0]},' + ','.join(f'{time:.6f}' for time in times)
+                + ',' + ','.join(map(str, counts)))
+
+    def get_summary(self, frames=None):
+        """Returns averages of the last frames, and the slowest frame time
+
+        The averages are in a dict keyed by the phases and counts, the
+        times of the phases in seconds.
+        """
+        rows = list(self.rows)[-frames:] if frames else list(self.rows)
+        if not rows:
+            return {}, 0.0
+        sums = [sum(values) for values in zip(*rows)][1:]
+        averages = dict(zip(self.PHASES + self.COUNTS,
+                            (total / len(rows) for total in sums)))
+        phases = len(self.PHASES)
+        slowest = max(sum(row[1:1 + phases]) for row in rows)
+        return averages, slowest
+
+    def get_summary_text(self, frames=None):
+        averages, slowest = self.get_summary(frames)
+        if not averages:
+            return 'no frames yet'
+        frame_time = sum(averages[phase] for phase in self.PHASES)
+        phases = ' '.join(f'{phase} {averages[phase] * 1000:.1f}'
+                          for phase in self.PHASES)
+        counts = ' '.join(f'{count} {averages[count]:.1f}'
+                          for count in self.COUNTS)
+        return (f'frame {frame_time * 1000:.1f} ms, slowest '
+                f'{slowest * 1000:.1f} ms | {phases} | {counts}')
+
+    def close(self):
+        if not self.logger:
+            return
+        for handler in self.logger.handlers:
+            handler.close()
+        self.logger = None
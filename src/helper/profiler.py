@@ -0,0 +1,145 @@
+import csv
+import functools
+import importlib
+import json
+import time
+from collections import defaultdict
+
+
+class Profiler:
+    """Records wall time and call counts of the hot paths, per player turn
+
+    Nothing is hooked until the profiler is enabled, so it costs nothing
+    while it is off. Enabling it replaces the hooked methods on their classes
+    with timed versions, disabling puts the originals back. Only one profiler
+    can be enabled at a time.
+
+    Times include the time of hooked calls made from within, so an AI action
+    includes the path matrices it generated. Turns are the turns of
+    BoardModel, one per player, and the first turn is taken to be player 0's.
+
+        with Profiler() as profiler:
+            SimulationHandler(mapoptions).run()
+        profiler.write_json('profile.json')
+    """
+    hooks = (
+        ('src.components.board.brain', 'MonsterBrain', 'do_action'),
+        ('src.components.board.pathing', 'PathMatrixFactory',
+         'generate_path_matrix'),
+        ('src.components.board.pathing_components', 'AStarMatrixFactory',
+         'generate_path_matrix'),
+        ('src.components.board.pathing_components', 'TowerSearchMatrixFactory',
+         'generate_path_matrix'),
+        ('src.components.board.pathing_components', 'PathFinder', 'get_path'),
+        ('src.components.board.pathing_components', 'TowerDistanceFieldFactory',
+         'get_field_for'),
+        ('src.components.board.pathing_components', 'DestinationFieldFactory',
+         'get_field_for'),
+        ('src.components.combat.attack', 'AttackFactory',
+         'get_all_attacks_between_monsters'),
+        ('src.components.combat.attack', 'AttackFactory',
+         'get_attacks_between_monsters'),
+        ('src.components.combat.attack', 'AttackFactory',
+         'get_attack_between_monsters'),
+        ('src.components.combat.attack', 'AttackTable', 'get_for_monsters'),
+        ('src.components.combat.combatoutcome', 'CombatOutcomeCalculator',
+         'get_outcome_from_table'),
+        ('src.components.combat.combatlogbuilder', 'CombatLogBuilder',
+         'build_from_attacks'),
+    )
+    _enabled = None
+    _FIELDS = ('turn', 'player', 'hook', 'calls', 'seconds')
+
+    def __init__(self):
+        # records[(turn, player id)][hook name] = [calls, seconds]
+        self.records = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+        self.turn_key = (0, 0)
+        self._originals = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def enable(self):
+        assert Profiler._enabled is None, 'A profiler is already enabled'
+        Profiler._enabled = self
+        for module_name, class_name, method_name in self.hooks:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            method = cls.__dict__[method_name]
+            # class methods are timed around their function, then wrapped again
+            timed = self._make_timed(getattr(method, '__func__', method),
+                                     f'{class_name}.{method_name}')
+            if isinstance(method, (classmethod, staticmethod)):
+                timed = type(method)(timed)
+            self._hook(cls, method_name, timed)
+        board_model = importlib.import_module('src.model.board_model')
+        self._hook(board_model.BoardModel, 'on_end_turn', self._make_turn_end(
+            board_model.BoardModel.on_end_turn))
+
+    def disable(self):
+        for cls, method_name, original in reversed(self._originals):
+            setattr(cls, method_name, original)
+        self._originals.clear()
+        if Profiler._enabled is self:
+            Profiler._enabled = None
+
+    def _hook(self, cls, method_name, replacement):
+        self._originals.append((cls, method_name, cls.__dict__[method_name]))
+        setattr(cls, method_name, replacement)
+
+    def _make_timed(self, method, name):
+        records = self.records
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start_time = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record = records[self.turn_key][name]
+                record[0] += 1
+                record[1] += perf_counter() - start_time
+        return timed
+
+    def _make_turn_end(self, on_end_turn):
+        @functools.wraps(on_end_turn)
+        def turn_end(model):
+            on_end_turn(model)
+            self.turn_key = (model.turn, model.get_current_player().id_)
+        return turn_end
+
+    def get_rows(self):
+        """Returns a (turn, player, hook, calls, seconds) tuple per record"""
+        return [(turn, player, name, calls, seconds)
+                for (turn, player), hooks in self.records.items()
+                for name, (calls, seconds) in hooks.items()]
+
+    def get_totals(self):
+        """Returns {hook: (calls, seconds)} over all turns"""
+        totals = defaultdict(lambda: [0, 0.0])
+        for _, _, name, calls, seconds in self.get_rows():
+            totals[name][0] += calls
+            totals[name][1] += seconds
+        return {name: tuple(total) for name, total in totals.items()}
+
+    def write_json(self, path):
+        with open(path, 'w') as fd:
+            json.dump([dict(zip(self._FIELDS, row))
+                       for row in self.get_rows()], fd, indent=1)
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='') as fd:
+            writer = csv.writer(fd)
+            writer.writerow(self._FIELDS)
+            writer.writerows(self.get_rows())
+
+    def write(self, path):
+        """Writes csv if the path ends with .csv, json otherwise"""
+        if path.endswith('.csv'):
+            self.write_csv(path)
+        else:
+            self.write_json(path)
@@ -3,26 +3,36 @@ import logging
 from src.components.board import players
 from src.components.board.board import BoardBuilder
 from src.components.board.pathing import PathMatrixFactory, PathFactory
-from src.components.board.pathing_components import PathMatrix
-from src.components.combat.attack import AttackFactory, AttackCollection
+from src.components.board.pathing_components import PathMatrix, \
+    TowerDistanceFieldFactory, DestinationFieldFactory
+from src.components.combat.attack import AttackFactory, AttackCollection, \
+    AttackTable
 from src.components.combat.combatlog import CombatLog
+from src.components.combat.combatoutcome import CombatOutcomeCalculator, \
+    CombatOutcome
 from src.controller.mainmenu_controller import CappedCounter
 from src.helper.Misc.constants import AiType, Terrain
 from src.helper.Misc.datatables import DataTables
+from src.helper.Misc.random_streams import RandomStreams
 
 
 class BoardModel:
     """Holds everything related to the board and its rules"""
 
     def __init__(self, mapoptions=None):
+        DataTables.ensure_loaded()
         self.path_matrix: PathMatrix = None
         self.game_over = False
         self.turn = 0
         self.sun_stance = CappedCounter(0, 4)
+        seed = mapoptions.seed if mapoptions else None
+        self.random = RandomStreams(seed)
 
-        self.board = BoardBuilder().load_map(mapoptions)
+        self.board = BoardBuilder(self.random.map).load_map(mapoptions)
         self.players: players.PlayerList = self.board.players
         self.matrix_factory = PathMatrixFactory(self.board)
+        self.tower_field_factory = TowerDistanceFieldFactory(self.board)
+        self.destination_field_factory = DestinationFieldFactory(self.board)
 
         # check if there are any human players, if so the game ends when
         # all of them lose, otherwise it keeps going until one team wins
@@ -40,7 +50,7 @@ class BoardModel:
         for monster in self.board.monsters.get_for(current_player):
             monster.moved = False
             if self._is_on_terrain_that_heals(monster):
-                monster.tower_heal()
+                monster.tower_heal(self.random.healing)
         logging.info(f'Ending turn of {current_player}')
         self.turn += 1
         self.players.get_current_player().regenerate_mana()
@@ -97,6 +107,9 @@ class BoardModel:
         return True
 
     def _only_one_team_left(self):
+        # players without a team are all in team 0, the last one still wins
+        if len(self.players) == 1:
+            return True
         teams = set()
         for player in self.players:
             teams.add(player.team)
@@ -142,9 +155,20 @@ class BoardModel:
 
     def get_expected_damage_between(self, attacker, defender, attack_range):
         """This uses current sun stance"""
-        attacks = self.get_short_and_long_attacks((attacker, defender))
-        return (attacks.get_attack(0, attack_range).get_expected_damage(),
-                attacks.get_attack(1, attack_range).get_expected_damage())
+        table = self.get_attack_table((attacker, defender))
+        return (table.get_expected_damage(0, attack_range),
+                table.get_expected_damage(1, attack_range))
+
+    def get_combat_outcome_between(self, attacker, defender,
+                                   attack_range) -> CombatOutcome:
+        """This uses current sun stance"""
+        monsters = (attacker, defender)
+        return CombatOutcomeCalculator().get_outcome_from_table(
+            self.get_attack_table(monsters), monsters, attack_range)
+
+    def get_attack_table(self, monsters) -> AttackTable:
+        """Cached, use this instead of attacks when no combat follows"""
+        return AttackTable.get_for_monsters(monsters, self.sun_stance.value)
 
     def get_short_and_long_attacks(self, monsters) -> AttackCollection:
         attack_factory = AttackFactory()
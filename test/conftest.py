@@ -0,0 +1,22 @@
+import pytest
+
+from src.components.combat.matchups import MatchupMatrix
+from src.helper.Misc import datatables
+from src.helper.Misc.datatables import DataTables
+
+
+@pytest.fixture(scope='session', autouse=True)
+def data_tables(tmp_path_factory):
+    """The data tables are loaded once, like the game does at start
+
+    Caches go to a temporary directory, so the tests write nothing outside
+    of it.
+    """
+    cache_directory = tmp_path_factory.mktemp('cache')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(datatables, 'table_cache_location',
+                            str(cache_directory / 'tables.pickle'))
+        monkeypatch.setattr(MatchupMatrix, 'cache_location',
+                            str(cache_directory / 'matchups.bin'))
+        DataTables.ensure_loaded()
+        yield
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 from src.abstract.controller import ControllerInfoFactory
@@ -129,7 +132,10 @@ class TestMoving(TestCase):
                                      self.player_2)
         self.click_on(monster_pos)
         self.click_on(enemy_pos)
-        assert self.controller.precombat_window.attacks is not None
+        assert self.controller.precombat_window.attacks is \
+            self.controller.model.get_attack_table(
+                (self.board.monster_at(monster_pos),
+                 self.board.monster_at(enemy_pos)))
         self.controller.precombat_window.handle_attack_choice(0)
         self.tick_events()
         self.controller.combat_window.handle_mouseclick()
@@ -337,3 +343,97 @@ class TestTowerCapture(TestCase):
         player = monster.owner
         # assumes player starts with 6 towers (adjacent tiles)
         assert player.tower_count == 7
+
+
+class TestFastForward:
+    """Skipping the animations of computer turns leaves the same model"""
+
+    @staticmethod
+    def play_computer_turn(frame_time=0):
+        """Frame time gives a worker thread time to plan between ticks"""
+        info = ControllerInfoFactory().make()
+        mapoptions = MapOptions()
+        mapoptions.seed = 7
+        mapoptions.ai_types = {0: AiType.human, 1: AiType.default,
+                               2: AiType.idle, 3: AiType.idle}
+        controller = BoardController(0, 0, 500, 500, info, mapoptions)
+        model = controller.model
+        player_1, player_2 = model.players[:2]
+        model.board.place_new_monster(
+            Monster.Type.ROMAN, roman_start_pos, player_1)
+        model.board.place_new_monster(
+            Monster.Type.CHIMERA, chim_start_pos, player_2)
+        model.board.place_new_monster(Monster.Type.TROLL, (3, 17), player_2)
+        controller.handle_end_of_turn()
+        ticks = 0
+        while model.get_current_player() is not player_1:
+            info.publisher.tick_events()
+            ticks += 1
+            assert ticks < 10000
+            time.sleep(frame_time)
+        monsters = sorted(
+            (monster.pos, monster.type, monster.hp, monster.exp, player.id_)
+            for player in model.players for monster in player.monsters)
+        towers = sorted((pos, owner.id_ if owner else None)
+                        for pos, owner in model.board.towers.towers.items())
+        return (monsters, towers, [player.mana for player in model.players],
+                info.publisher.ticks_per_frame), ticks
+
+    def test_same_model_in_fewer_ticks(self, monkeypatch):
+        state, ticks = self.play_computer_turn()
+        monkeypatch.setattr(Options, 'skip_ai_animations', True)
+        monkeypatch.setattr(Options, 'fast_forward_ticks', 4)
+        fast_state, fast_ticks = self.play_computer_turn()
+        assert fast_state == state
+        assert fast_ticks < ticks / 4
+
+
+class TestThreadedAi:
+    def test_same_model_as_without_thread(self, monkeypatch):
+        state, _ = TestFastForward.play_computer_turn()
+        monkeypatch.setattr(Options, 'threaded_ai', True)
+        threaded_state, _ = TestFastForward.play_computer_turn(0.001)
+        assert threaded_state == state
+
+    def test_worker_error_is_raised_on_main_thread(self, monkeypatch):
+        monkeypatch.setattr(Options, 'threaded_ai', True)
+        info = ControllerInfoFactory().make()
+        mapoptions = MapOptions()
+        mapoptions.ai_types = {0: AiType.human, 1: AiType.default,
+                               2: AiType.idle, 3: AiType.idle}
+        controller = BoardController(0, 0, 500, 500, info, mapoptions)
+        brain = controller.brains[controller.model.players[1]]
+
+        def fail():
+            raise ValueError('no plan')
+        monkeypatch.setattr(brain, 'do_action', fail)
+        controller.handle_end_of_turn()
+        with pytest.raises(ValueError):
+            for _ in range(1000):
+                info.publisher.tick_events()
+                time.sleep(0.001)
+
+    def test_main_thread_error_ends_the_worker(self, monkeypatch):
+        monkeypatch.setattr(Options, 'threaded_ai', True)
+        info = ControllerInfoFactory().make()
+        mapoptions = MapOptions()
+        mapoptions.ai_types = {0: AiType.human, 1: AiType.default,
+                               2: AiType.idle, 3: AiType.idle}
+        controller = BoardController(0, 0, 500, 500, info, mapoptions)
+        brain = controller.brains[controller.model.players[1]]
+        monkeypatch.setattr(
+            brain, 'do_action',
+            lambda: brain.controller.handle_move_monster(None, None))
+
+        def fail(monster, path):
+            raise ValueError('no move')
+        monkeypatch.setattr(controller, 'handle_move_monster', fail)
+        controller.handle_end_of_turn()
+        with pytest.raises(ValueError):
+            for _ in range(1000):
+                info.publisher.tick_events()
+                time.sleep(0.001)
+        assert not any(thread.name == 'ai action'
+                       for thread in threading.enumerate())
+        assert not controller.threaded_ai.is_planning()
+        assert controller.threaded_ai.calls.empty()
@@ -1,6 +1,14 @@
+import random
+
 import pytest
 
-from src.components.board.board import BoardBuilder
+from src.components.board.board import BoardBuilder, AdjacencyTable, \
+    MapOptions, BoardTextBuilder, RandomBoardBuilder
+from src.components.board.mapfile import MapFile, convert_text_map
+from src.components.board.mapgenerator import MapGenerator
+from src.helper.Misc.constants import MonsterType, Terrain
+from src.helper.Misc.datatables import DataTables
+from src.model.board_model import BoardModel
 
 
 class TestBoard:
@@ -30,3 +38,204 @@ class TestBoard:
             self.board.capture_terrain_at(pos, player_0)
         towers = towerlist.get_capturable_towers_for_player(player_0)
         assert not towers
+
+    def test_flat_storage_matches_tile_view(self, before):
+        pos = (3, 5)
+        tile = self.board.tile_at(pos)
+        self.board.set_terrain_to(pos, Terrain.FOREST)
+        assert tile.terrain == Terrain.FOREST
+        assert self.board.terrain[self.board.index_of(pos)] == Terrain.FOREST
+        monster = self.board.place_new_monster(
+            MonsterType.TROLL, pos, self.player_1)
+        assert tile.monster is monster
+        self.board.set_monster_pos(monster, (4, 5))
+        assert tile.monster is None
+        assert self.board.monster_at((4, 5)) is monster
+        assert tile == self.board.tile_at(pos)
+
+    def test_off_board_posses_are_rejected(self, before):
+        self.board.set_dimensions(3, 4)
+        for pos in ((0, -1), (-1, 3), (0, 4), (3, 0)):
+            with pytest.raises(AssertionError):
+                self.board.terrain_at(pos)
+            with pytest.raises(AssertionError):
+                self.board.monster_at(pos)
+        index = self.board.index_of((2, 3))
+        assert self.board.terrain_at_index(index) == Terrain.GRASS
+        assert self.board.monster_at_index(index) is None
+
+    def test_set_dimensions_fills_with_grass(self, before):
+        self.board.set_dimensions(7, 3)
+        assert len(self.board.terrain) == 21
+        assert len(self.board.occupants) == 21
+        assert self.board.terrain_at((6, 2)) == Terrain.GRASS
+        assert self.board.monster_at((6, 2)) is None
+
+    def test_adjacency_table_follows_dimensions(self, before):
+        for x_max, y_max in ((5, 4), (2, 9)):
+            self.board.set_dimensions(x_max, y_max)
+            for x in range(x_max):
+                for y in range(y_max):
+                    expected = AdjacencyTable.compute_posses_adjacent_to(
+                        (x, y), x_max, y_max)
+                    assert (list(self.board.get_posses_adjacent_to((x, y)))
+                            == expected)
+
+    def test_move_costs_follow_terrain(self, before):
+        terrain_type = 3
+        self.board.get_move_costs(terrain_type)
+        self.board.set_terrain_to((3, 5), Terrain.VOLCANO)
+        self.assert_move_costs_match_terrain(terrain_type)
+        self.board.set_dimensions(6, 4)
+        self.board.set_terrain_to((2, 1), Terrain.RIVER)
+        assert len(self.board.get_move_costs(terrain_type)) == 24
+        self.assert_move_costs_match_terrain(terrain_type)
+
+    def test_move_costs_follow_data_tables(self, before, monkeypatch):
+        terrain_type = 3
+        self.board.set_terrain_to((3, 5), Terrain.FOREST)
+        assert self.board.move_cost_at((3, 5), terrain_type) != 7
+        version = self.board.version
+        terrain_cost = [list(row) for row in DataTables.terrain_cost]
+        terrain_cost[Terrain.FOREST][terrain_type] = 7
+        monkeypatch.setattr(DataTables, 'terrain_cost', terrain_cost)
+        monkeypatch.setattr(DataTables, 'version', DataTables.version + 1)
+        assert self.board.move_cost_at((3, 5), terrain_type) == 7
+        assert self.board.version > version
+        self.assert_move_costs_match_terrain(terrain_type)
+
+    def assert_move_costs_match_terrain(self, terrain_type):
+        for x in range(self.board.x_max):
+            for y in range(self.board.y_max):
+                assert self.board.move_cost_at((x, y), terrain_type) == \
+                    DataTables.get_terrain_cost(
+                        self.board.terrain_at((x, y)), terrain_type)
+
+
+class TestMapFile:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self, tmp_path):
+        self.text_path = str(tmp_path / 'towers.map')
+        layout = [3, 2, 5, 2, 5, 7, 2, 5, 0, 1, 2, 0, 0, 0, 0, 0]
+        with open(self.text_path, 'w') as fd:
+            fd.write(', '.join(map(str, layout)))
+        self.binary_path = convert_text_map(self.text_path)
+
+    @staticmethod
+    def load(mapname):
+        mapoptions = MapOptions()
+        mapoptions.mapname = mapname
+        mapoptions.set_number_of_players(2)
+        return BoardBuilder().load_map(mapoptions)
+
+    def test_converted_map_keeps_layout(self, before):
+        map_file = MapFile.read(self.binary_path)
+        assert (map_file.x_max, map_file.y_max) == (3, 2)
+        assert list(map_file.terrain) == [5, 2, 5, 7, 2, 5]
+        assert map_file.start_posses == ((0, 1), (2, 0), (0, 0), (0, 0))
+        assert map_file.towers == ((0, 1), (2, 0))
+
+    def test_binary_map_loads_like_text_map(self, before):
+        board = self.load(self.binary_path)
+        text_board = self.load(self.text_path)
+        assert board.terrain == text_board.terrain
+        assert list(board.towers) == list(text_board.towers)
+        assert [lord.pos for lord in board.lords] == \
+            [lord.pos for lord in text_board.lords]
+
+    def test_load_terrain_resets_derived_data(self, before):
+        board = self.load(self.text_path)
+        terrain_type = 3
+        board.get_move_costs(terrain_type)
+        version, towers_version = board.version, board.towers.version
+        lord = board.monster_at((0, 1))
+        board.load_terrain(bytes([Terrain.FOREST] * 6), [(1, 1)])
+        assert board.version > version
+        assert board.towers.version > towers_version
+        assert list(board.towers) == [(1, 1)]
+        assert lord.terrain == Terrain.FOREST
+        assert set(board.get_move_costs(terrain_type)) == {
+            DataTables.get_terrain_cost(Terrain.FOREST, terrain_type)}
+
+
+class TestBulkTerrain:
+    def test_text_board_rows_and_towers(self):
+        legend = {'.': Terrain.GRASS, 'T': Terrain.TOWER,
+                  'X': Terrain.VOLCANO}
+        layout = """3 2
+                    .  T  X
+                      T  .  ."""
+        board = BoardTextBuilder().make_board_from_text(layout, legend)
+        assert board.terrain_at((1, 0)) == Terrain.TOWER
+        assert board.terrain_at((2, 0)) == Terrain.VOLCANO
+        assert board.terrain_at((0, 1)) == Terrain.TOWER
+        assert list(board.towers) == [(0, 1), (1, 0)]
+        assert board.tower_owner_at((1, 0)) is None
+
+    def test_random_board_towers_match_terrain(self):
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'random'
+        board = RandomBoardBuilder(random.Random(2)).load_map(
+            20, 30, mapoptions)
+        towers = [(x, y) for x in range(20) for y in range(30)
+                  if board.terrain_at((x, y)) == Terrain.TOWER]
+        assert towers
+        assert list(board.towers) == towers
+        tiles = 20 * 30
+        assert list(board.terrain).count(Terrain.VOLCANO) == round(tiles * 0.05)
+
+
+class TestMapGenerator:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self):
+        self.mapoptions = self.make_mapoptions()
+        self.model = BoardModel(self.mapoptions)
+        self.board = self.model.board
+
+    @staticmethod
+    def make_mapoptions():
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'generated'
+        mapoptions.map_size = (40, 30)
+        mapoptions.seed = 4
+        return mapoptions
+
+    def test_lords_start_on_castles_with_towers(self, before):
+        assert (self.board.x_max, self.board.y_max) == (40, 30)
+        assert len(self.board.players) == 4
+        for lord in self.board.lords:
+            assert self.board.terrain_at(lord.pos) == Terrain.CASTLE
+            assert lord.owner.tower_count == 6
+        towers = [(x, y) for x in range(40) for y in range(30)
+                  if self.board.terrain_at((x, y)) == Terrain.TOWER]
+        assert sorted(self.board.towers) == towers
+        assert len(towers) > 24
+
+    def test_lords_are_connected_by_roads(self, before):
+        walkable = (Terrain.GRASS, Terrain.CASTLE, Terrain.TOWER)
+        start = self.board.lords.get_for(self.board.players[0]).pos
+        reached = {start}
+        todo = [start]
+        while todo:
+            for pos in self.board.get_posses_adjacent_to(todo.pop()):
+                if (pos not in reached
+                        and self.board.terrain_at(pos) in walkable):
+                    reached.add(pos)
+                    todo.append(pos)
+        for lord in self.board.lords:
+            assert lord.pos in reached
+
+    def test_same_seed_makes_same_map(self, before):
+        board = BoardModel(self.make_mapoptions()).board
+        assert board.terrain == self.board.terrain
+        mapoptions = self.make_mapoptions()
+        mapoptions.seed = 5
+        assert BoardModel(mapoptions).board.terrain != self.board.terrain
+
+    def test_large_map(self, before):
+        map_file = MapGenerator(random.Random(0)).generate(512, 512)
+        assert len(map_file.terrain) == 512 * 512
+        assert len(map_file.start_posses) == 4
+        assert len(map_file.towers) > 1000
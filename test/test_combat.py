@@ -1,10 +1,16 @@
+import random
+
 import pytest
 
 from src.components.board.monster import Monster
 from src.components.board.players import Player
 from src.helper.Misc.constants import MonsterType, Terrain, Range, DayTime
+from src.helper.Misc.datatables import DataTables
 from src.components.combat.combatlogbuilder import CombatLogBuilder
-from src.components.combat.attack import Attack
+from src.components.combat.attack import Attack, AttackTable
+from src.components.combat.batchcombat import BatchCombatBuilder, NO_WINNER
+from src.components.combat.combatoutcome import CombatOutcomeCalculator, \
+    get_hp_chances
 from src.controller.board_controller import BoardModel
 
 
@@ -227,3 +233,126 @@ class TestPromotionFromMultipleRounds(TestRomanCombat):
     def combat_rounds(self, _max):
         for n in range(_max):
             self.combat_round()
+
+
+class TestCombatOutcome(TestRomanCombat):
+    def test_matches_combat_with_perfect_accuracy(self, before):
+        self.roman_b.hp = 9
+        attacks = self.model.get_short_and_long_attacks(
+            (self.roman_a, self.roman_b))
+        for side in range(2):
+            attacks.get_attack(side, Range.CLOSE).accuracy = 100
+        outcome = CombatOutcomeCalculator().get_outcome(attacks, Range.CLOSE)
+        self.combat_result = self.combat.build_from_attacks(
+            attacks, Range.CLOSE)
+        self.assert_no_promotions()
+        assert outcome.hp_chances == {tuple(self.combat_result.hp_end): 1}
+        assert outcome.get_kill_chance(1) == 1
+
+    def test_fatal_hit_ends_combat(self, before):
+        # the defender only gets to hit if the attacker misses
+        hp_chances = dict(get_hp_chances((5, 50, 1, 10), (10, 100, 1, 5)))
+        assert hp_chances == {(10, 0): 0.5, (0, 5): 0.5}
+
+    def test_chances_add_up(self, before):
+        outcome = self.model.get_combat_outcome_between(
+            self.roman_a, self.roman_b, Range.CLOSE)
+        assert sum(outcome.hp_chances.values()) == pytest.approx(1)
+        # 60% accuracy, 4 damage and 3 hits against 33 hp, nobody dies
+        assert outcome.get_kill_chance(0) == 0
+        assert outcome.get_expected_hp(1) == pytest.approx(33 - 0.6 * 12)
+
+    def test_no_hits_changes_nothing(self, before):
+        outcome = self.model.get_combat_outcome_between(
+            self.roman_a, self.roman_b, Range.LONG)
+        assert outcome.hp_chances == {(33, 33): 1}
+
+
+class TestAttackTable(TestRomanCombat):
+    def more(self):
+        self.monsters = (self.roman_a, self.roman_b)
+        self.table = AttackTable.get_for_monsters(
+            self.monsters, DayTime.SUNRISE)
+
+    def test_matches_attacks(self, before):
+        attacks = self.model.get_short_and_long_attacks(self.monsters)
+        for side in range(2):
+            for attack_range in range(2):
+                attack = attacks.get_attack(side, attack_range)
+                assert self.table.get_attack(side, attack_range) == (
+                    attack.damage, attack.accuracy, attack.hits)
+                assert self.table.get_expected_damage(side, attack_range) == \
+                    attack.get_expected_damage()
+
+    def test_shared_between_same_monsters(self, before):
+        roman_c = self.board.place_new_monster(
+            Monster.Type.ROMAN, (6, 6), self.model.players[1])
+        roman_c.terrain = self.roman_b.terrain
+        roman_c.exp = 29
+        assert AttackTable.get_for_monsters(
+            (self.roman_a, roman_c), DayTime.SUNRISE) is self.table
+
+    def test_new_table_for_more_exp(self, before):
+        self.roman_a.exp = 90
+        table = AttackTable.get_for_monsters(self.monsters, DayTime.SUNRISE)
+        assert table is not self.table
+        assert table.get_attack(0, Range.CLOSE)[0] > \
+            self.table.get_attack(0, Range.CLOSE)[0]
+
+    def test_new_table_for_other_sun_stance(self, before):
+        assert AttackTable.get_for_monsters(
+            self.monsters, DayTime.NIGHT) is not self.table
+
+    def test_least_recently_used_dropped(self, before, monkeypatch):
+        monkeypatch.setattr(AttackTable, 'MAX_TABLES', 2)
+        AttackTable._tables.clear()
+        first = AttackTable.get_for_monsters(self.monsters, DayTime.DAY)
+        AttackTable.get_for_monsters(self.monsters, DayTime.NIGHT)
+        assert AttackTable.get_for_monsters(
+            self.monsters, DayTime.DAY) is first
+        AttackTable.get_for_monsters(self.monsters, DayTime.SUNRISE)
+        assert len(AttackTable._tables) == 2
+        assert AttackTable.get_for_monsters(
+            self.monsters, DayTime.DAY) is first
+
+    def test_cleared_when_data_tables_reload(self, before, monkeypatch):
+        monkeypatch.setattr(DataTables, 'version', DataTables.version + 1)
+        assert AttackTable.get_for_monsters(
+            self.monsters, DayTime.SUNRISE) is not self.table
+
+
+class TestBatchCombat(TestRomanCombat):
+    def more(self):
+        self.monsters = (self.roman_a, self.roman_b)
+
+    def test_matches_combat_logs(self, before, monkeypatch):
+        monkeypatch.setattr(CombatLogBuilder, 'perfect_accuracy', False)
+        rng = random.Random(5)
+        logs = [CombatLogBuilder(rng).build_from_monsters(
+            self.monsters, Range.CLOSE, DayTime.SUNRISE) for _ in range(20)]
+        result = BatchCombatBuilder(random.Random(5)).build_from_monsters(
+            [self.monsters] * 20, Range.CLOSE, DayTime.SUNRISE)
+        for n, log in enumerate(logs):
+            assert [result.hp_end[0][n], result.hp_end[1][n]] == log.hp_end
+            assert [result.exp[0][n], result.exp[1][n]] == log.exp
+            assert result.winners[n] == NO_WINNER
+
+    def test_winner_gets_exp(self, before):
+        self.roman_b.hp = 4
+        builder = BatchCombatBuilder()
+        builder.perfect_accuracy = True
+        result = builder.build_from_monsters(
+            [self.monsters], Range.CLOSE, DayTime.SUNRISE)
+        assert result.winners[0] == 0
+        assert result.hp_end[0][0] == 33 and result.hp_end[1][0] == 0
+        assert result.exp[0][0] == 16 and result.exp[1][0] == 0
+        assert result.get_win_rate(0) == 1
+
+    def test_fights_from_numbers(self, before):
+        builder = BatchCombatBuilder()
+        builder.perfect_accuracy = True
+        result = builder.build([((5, 100, 1, 10, 1), (10, 100, 1, 5, 2)),
+                                ((0, 0, 0, 7, 1), (0, 0, 0, 8, 1))])
+        assert list(result.winners) == [0, NO_WINNER]
+        assert list(result.exp[0]) == [32, 1]
+        assert list(result.hp_end[1]) == [0, 8]
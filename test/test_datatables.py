@@ -0,0 +1,104 @@
+import pytest
+
+from src.components.board.board import RandomBoardBuilder, MapOptions
+from src.components.board.pathing import PathMatrixFactory
+from src.handlers.tournament_handler import TournamentHandler, \
+    get_match_setups
+from src.helper.Misc import datatables
+from src.helper.Misc.constants import AiType, MonsterType, Terrain
+from src.helper.Misc.datatables import DataTables, TableCache, TableLoader
+
+
+class TestTableCache:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self, tmp_path, monkeypatch):
+        self.tmp_path = tmp_path
+        monkeypatch.setattr(datatables, 'table_cache_location',
+                            str(tmp_path / 'cache' / 'tables.pickle'))
+        for name in ('terrain_cost', 'terrain_name', 'terrain_defense',
+                     'summon_options', 'monster_stats', 'loaded', 'version'):
+            monkeypatch.setattr(DataTables, name, getattr(DataTables, name))
+        self.monkeypatch = monkeypatch
+
+    @staticmethod
+    def parse():
+        class Tables:
+            terrain_cost = []
+            terrain_name = []
+            terrain_defense = []
+            summon_options = {}
+            monster_stats = []
+        TableLoader(Tables).load_tables()
+        return Tables
+
+    def forbid_parsing(self):
+        def fail(*args):
+            raise AssertionError('tables were parsed')
+        self.monkeypatch.setattr(TableLoader, 'load_tables', fail)
+
+    def test_loaded_tables_match_csv(self, before):
+        parsed = self.parse()
+        DataTables.load()
+        self.forbid_parsing()
+        DataTables.load()
+        assert DataTables.terrain_cost == parsed.terrain_cost
+        assert DataTables.terrain_defense == parsed.terrain_defense
+        assert DataTables.summon_options == parsed.summon_options
+        assert len(DataTables.monster_stats) == len(parsed.monster_stats)
+        for cached, stats in zip(DataTables.monster_stats,
+                                 parsed.monster_stats):
+            for name in stats.__slots__:
+                assert getattr(cached, name) == getattr(stats, name)
+
+    def test_parsed_again_when_csv_changed(self, before):
+        DataTables.load()
+        stats = self.tmp_path / 'stats.csv'
+        with open(datatables.stats_csv_location) as fd:
+            stats.write_text(fd.read() + '\n')
+        self.monkeypatch.setattr(datatables, 'stats_csv_location', str(stats))
+        assert not TableCache(DataTables).load_tables()
+
+    def test_broken_cache_is_ignored(self, before):
+        (self.tmp_path / 'cache').mkdir()
+        with open(datatables.table_cache_location, 'wb') as fd:
+            fd.write(b'broken')
+        assert not TableCache(DataTables).load_tables()
+        DataTables.load()
+        assert TableCache(DataTables).load_tables()
+
+    def test_reload_does_not_add_to_tables(self, before):
+        DataTables.load()
+        size = len(DataTables.monster_stats)
+        DataTables.load()
+        assert len(DataTables.monster_stats) == size
+
+
+class TestEntryPoints:
+    """Tables are loaded by whatever first needs them, not only the game"""
+
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self, monkeypatch):
+        for name in ('terrain_cost', 'terrain_name', 'terrain_defense',
+                     'summon_options', 'monster_stats', 'loaded', 'version'):
+            monkeypatch.setattr(DataTables, name, getattr(DataTables, name))
+        DataTables._clear()
+        DataTables.loaded = False
+
+    def test_path_matrix_on_random_board(self, before):
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'random'
+        board = RandomBoardBuilder().load_map(12, 12, mapoptions)
+        board.set_terrain_to((5, 5), Terrain.GRASS)
+        monster = board.place_new_monster(MonsterType.TROLL, (5, 5))
+        matrix = PathMatrixFactory(board).generate_path_matrix(monster.pos)
+        assert monster.pos in matrix
+
+    def test_tournament_report(self, before):
+        setups = get_match_setups(
+            range(1), ai_lineups=((AiType.idle, AiType.idle),),
+            lord_lineups=((MonsterType.DAIMYOU, MonsterType.WIZARD),),
+            max_turns=4)
+        report = TournamentHandler(setups, processes=1).run().report()
+        assert 'Daimyou' in report
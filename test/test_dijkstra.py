@@ -9,6 +9,7 @@ from src.components.board.monster import Monster
 from src.components.board.pathing import PathMatrixFactory
 from src.components.board.pathing_components import AStarMatrixFactory
 from src.helper.Misc.constants import IMPASSIBLE, UNEXPLORED
+from src.helper.Misc.options_game import Options
 
 
 class TestCase:
@@ -158,3 +159,64 @@ class TestDijkstraAlgorithm(TestCase):
         return (f'wrong val at pos {pos}\n'
                 'Dijkstra:\n'
                 f'{dijkstra_printer.get_printable_values()}')
+
+
+class TestHeapMatchesScanning(TestCase):
+    """The heap search should give the same output as the original scan"""
+
+    def test_same_dist_and_prev(self, before):
+        for start in ((0, 0), (9, 9), (19, 5)):
+            monster = self._place_monster(start)
+            graph = DijkstraGraph(self.board, monster)
+            dist, prev = graph.dijkstra(start)
+            reference = DijkstraGraph(self.board, monster)
+            reference.make_all_edges()
+            expected_dist, expected_prev = self.scan(reference, start)
+            assert dist == expected_dist
+            assert prev == expected_prev
+            self.board.remove_monster(monster)
+
+    def scan(self, graph, source):
+        """Original O(V^2) version, picks the next node by scanning"""
+        unvisited_nodes = set()
+        dist = {}
+        prev = {}
+        for x in range(self.board.x_max):
+            for y in range(self.board.y_max):
+                dist[(x, y)] = DijkstraGraph.INFINITY
+                prev[(x, y)] = DijkstraGraph.INFINITY
+                unvisited_nodes.add((x, y))
+        dist[source] = 0
+        while unvisited_nodes:
+            node = None
+            for candidate in unvisited_nodes:
+                if node is None or dist[candidate] < dist[node]:
+                    node = candidate
+            unvisited_nodes.remove(node)
+            if node in graph.edges:
+                for _, edge in graph.edges[node].items():
+                    alt = dist[node] + edge.length
+                    if alt < dist[edge.to_node]:
+                        dist[edge.to_node] = alt
+                        prev[edge.to_node] = node
+        return dist, prev
+
+
+class TestValidationOnLargeBoard:
+    def test_validate_matrices_on_large_board(self):
+        random.seed(3)
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'random'
+        board = RandomBoardBuilder().load_map(100, 100, mapoptions)
+        generator = PathMatrixFactory(board)
+        player = board.get_current_player()
+        Options.validate_path_matrices = True
+        try:
+            for monster_type in range(1, Monster.Type.TAITAN, 7):
+                pos = (random.randint(0, 99), random.randint(0, 99))
+                if board.monster_at(pos):
+                    continue
+                board.place_new_monster(monster_type, pos, player)
+                generator.generate_path_matrix(pos)
+        finally:
+            Options.validate_path_matrices = False
@@ -0,0 +1,68 @@
+import pytest
+
+from src.helper.events import EventCallback, Publisher
+from src.helper.framestats import FrameStats
+
+
+class TestFrameStats:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self, tmp_path):
+        self.log_path = str(tmp_path / 'logs' / 'frames.log')
+        self.frame_stats = FrameStats(self.log_path)
+        yield
+        self.frame_stats.close()
+
+    def add_frames(self, frames):
+        for n in range(frames):
+            self.frame_stats.add_frame((0.001, 0.002 * n, 0.003, 0.004),
+                                       (2, n, 4, 1))
+
+    def test_summary_of_last_frames(self, before):
+        self.add_frames(4)
+        averages, slowest = self.frame_stats.get_summary(2)
+        assert averages['events'] == pytest.approx(0.005)
+        assert averages['callbacks'] == 2.5
+        assert averages['rects'] == 4
+        assert slowest == pytest.approx(0.014)
+        assert self.frame_stats.get_summary_text().startswith('frame 11.0 ms')
+
+    def test_keeps_recent_frames_only(self, before):
+        self.add_frames(FrameStats.HISTORY + 5)
+        assert len(self.frame_stats.rows) == FrameStats.HISTORY
+        assert self.frame_stats.rows[0][0] == 5
+
+    def test_logs_every_frame(self, before):
+        self.add_frames(3)
+        self.frame_stats.close()
+        with open(self.log_path) as fd:
+            lines = fd.read().splitlines()
+        assert lines[0] == ','.join(FrameStats.FIELDS)
+        assert lines[3] == '2,0.001000,0.004000,0.003000,0.004000,2,2,4,1'
+
+    def test_log_rolls_over(self, before, monkeypatch):
+        self.frame_stats.close()
+        monkeypatch.setattr(FrameStats, 'LOG_BYTES', 200)
+        self.frame_stats = FrameStats(self.log_path)
+        self.add_frames(20)
+        self.frame_stats.close()
+        header = ','.join(FrameStats.FIELDS)
+        for path in (self.log_path, f'{self.log_path}.1'):
+            with open(path) as fd:
+                text = fd.read()
+            assert text.splitlines()[0] == header
+            assert len(text) <= 200
+
+
+class TestPublisherCounts:
+    def test_counts_polled_lists_and_played_callbacks(self):
+        publisher = Publisher()
+        for callbacks in (2, 3):
+            events = publisher.create_event_list()
+            for _ in range(callbacks):
+                events.append(EventCallback(lambda: None))
+            events.subscribe()
+        publisher.tick_events()
+        assert (publisher.polled_count, publisher.played_count) == (2, 5)
+        publisher.tick_events()
+        assert (publisher.polled_count, publisher.played_count) == (2, 5)
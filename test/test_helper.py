@@ -1,5 +1,6 @@
 from math import floor
 
+from src.helper.Misc.random_streams import RandomStreams
 from src.helper.functions import get_hexagonal_manhattan_distance
 
 
@@ -206,3 +207,21 @@ class TestManhattanDistance:
         self.check((6, 2), 6)
         self.check((6, 3), 7)
         self.check((6, 4), 7)
+
+
+class TestRandomStreams:
+    def test_same_seed_gives_same_numbers(self):
+        streams_1 = RandomStreams(5)
+        streams_2 = RandomStreams(5)
+        for name in ('combat', 'healing', 'ai', 'map'):
+            numbers_1 = [getattr(streams_1, name).random() for _ in range(5)]
+            numbers_2 = [getattr(streams_2, name).random() for _ in range(5)]
+            assert numbers_1 == numbers_2
+
+    def test_streams_are_independent(self):
+        streams_1 = RandomStreams(5)
+        streams_2 = RandomStreams(5)
+        for _ in range(10):
+            streams_1.combat.random()
+        assert streams_1.healing.random() == streams_2.healing.random()
+        assert streams_1.combat.random() != streams_1.ai.random()
@@ -0,0 +1,76 @@
+import pytest
+
+from src.components.board.monster import Monster
+from src.components.board.players import Player
+from src.components.combat import matchups
+from src.components.combat.matchups import MatchupMatrix, MatchupMatrixBuilder
+from src.components.combat.attack import AttackFactory
+from src.components.combat.combatoutcome import CombatOutcomeCalculator
+from src.helper.Misc.constants import Terrain, Range, DayTime
+from src.helper.Misc.datatables import DataTables
+
+
+class TestMatchupMatrix:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self, tmp_path, monkeypatch):
+        DataTables.ensure_loaded()
+        # a few monster types keep the matrix small enough to build quickly
+        monkeypatch.setattr(
+            DataTables, 'monster_stats', DataTables.monster_stats[:4])
+        self.path = str(tmp_path / 'cache' / 'matchups.bin')
+        self.matrix = MatchupMatrix(self.path)
+        yield
+        self.matrix.close()
+
+    def test_building_is_logged(self, before, caplog):
+        self.matrix.close()
+        self.matrix = MatchupMatrix(self.path)
+        assert not caplog.records
+        self.matrix.close()
+        with open(self.path, 'r+b') as fd:
+            fd.write(b'XXXX')
+        self.matrix = MatchupMatrix(self.path)
+        assert 'building the matchup matrix for 4 monster types' in \
+            caplog.text
+
+    def test_matches_combat_outcome(self, before):
+        monsters = (Monster(3, (0, 0), Player(0), Terrain.FOREST),
+                    Monster(2, (0, 1), Player(1), Terrain.FOREST))
+        attacks = AttackFactory().get_all_attacks_between_monsters(
+            monsters, DayTime.NIGHT)
+        outcome = CombatOutcomeCalculator().get_outcome(attacks, Range.LONG)
+        damage, kill_chance, exp = self.matrix.get_values(
+            3, 2, Range.LONG, Terrain.FOREST, DayTime.NIGHT)
+        assert damage == pytest.approx(
+            attacks.get_attack(0, Range.LONG).get_expected_damage())
+        assert kill_chance == pytest.approx(outcome.get_kill_chance(1))
+        assert exp > 0
+        assert self.matrix.get_value(
+            3, 2, Range.LONG, Terrain.FOREST, DayTime.NIGHT,
+            MatchupMatrix.KILL_CHANCE) == kill_chance
+
+    def test_file_is_reused(self, before, monkeypatch):
+        def fail(*args):
+            raise AssertionError('matrix was built again')
+        monkeypatch.setattr(MatchupMatrixBuilder, 'write', fail)
+        matrix = MatchupMatrix(self.path)
+        assert matrix.get_values(1, 2, Range.CLOSE, Terrain.GRASS,
+                                 DayTime.DAY) == self.matrix.get_values(
+            1, 2, Range.CLOSE, Terrain.GRASS, DayTime.DAY)
+        matrix.close()
+
+    def test_built_again_when_data_changed(self, before, monkeypatch,
+                                           tmp_path):
+        self.matrix.close()
+        stats = tmp_path / 'stats.csv'
+        with open(matchups.stats_csv_location) as fd:
+            stats.write_text(fd.read() + '\n')
+        monkeypatch.setattr(matchups, 'stats_csv_location', str(stats))
+        built = []
+        write = MatchupMatrixBuilder.write
+        monkeypatch.setattr(MatchupMatrixBuilder, 'write',
+                            lambda builder, path: built.append(
+                                write(builder, path)))
+        self.matrix = MatchupMatrix(self.path)
+        assert len(built) == 1
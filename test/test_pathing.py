@@ -1,10 +1,17 @@
+import itertools
+import random
+
 import pytest
 
-from src.components.board.board import BoardTextBuilder
+from src.components.board.board import BoardTextBuilder, RandomBoardBuilder, \
+    MapOptions
 from src.components.board.monster import Monster
 from src.components.board.pathing import PathFinder, PathFactory
 from src.components.board.pathing import PathMatrixFactory
-from src.components.board.pathing_components import AStarMatrixFactory
+from src.components.board.pathing_components import AStarMatrixFactory, \
+    TowerDistanceField, TowerDistanceFieldFactory, DestinationFieldFactory
+from src.components.board.dijkstra import SimpleDijkstraGraph
+from src.helper.Misc.datatables import DataTables
 from src.helper.Misc.constants import MonsterType, Terrain, UNEXPLORED, \
     IMPASSIBLE
 
@@ -387,6 +394,7 @@ class TestTowerSearch(TestCase):
         expected = (chim_pos, (0, 5), (0, 4), (0, 3), (1, 3), (2, 2), tower_pos)
         self.compare(self.path, expected)
         assert self.path.furthest_reachable == (2, 2)
+        self.assert_closest_tower_in_field(chim_pos, tower_pos)
 
     def test_find_closest_tower(self, before):
         map_ = """6 10
@@ -409,8 +417,260 @@ class TestTowerSearch(TestCase):
         self.get_path_to_tower(chim_pos)
         assert self.path[-1] == closest_tower_pos
         assert self.path.furthest_reachable[1] == 4
+        self.assert_closest_tower_in_field(chim_pos, closest_tower_pos)
+
+    def test_field_matches_dijkstra(self, before):
+        random.seed(7)
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'random'
+        self.board = RandomBoardBuilder().load_map(20, 20, mapoptions)
+        player = self.board.get_current_player()
+        towers = self.board.towers.get_capturable_towers_for_player(player)
+        assert towers
+        monster = self.board.place_new_monster(Type.TROLL, (10, 10), player)
+        field = TowerDistanceField(self.board, player, monster.terrain_type)
+        field.fill_distance_values()
+        for pos in ((10, 10), (0, 0), (19, 19), (3, 15)):
+            self.board.set_monster_pos(monster, pos)
+            dist, _ = SimpleDijkstraGraph(self.board, monster).dijkstra(pos)
+            closest = min(dist[tower] for tower in towers)
+            if closest == SimpleDijkstraGraph.INFINITY:
+                assert field.get_closest_tower_from(pos) is None
+            else:
+                assert field.get_distance_value_at(pos) == closest
+                tower = field.get_closest_tower_from(pos)
+                assert dist[tower] == closest
+
+    def assert_closest_tower_in_field(self, pos, tower_pos):
+        monster = self.board.monster_at(pos)
+        factory = TowerDistanceFieldFactory(self.board)
+        field = factory.get_field_for(monster.owner, monster.terrain_type)
+        assert field.get_closest_tower_from(pos) == tower_pos
+        assert factory.get_field_for(
+            monster.owner, monster.terrain_type) is field
+        self.board.capture_terrain_at(tower_pos, monster.owner)
+        assert factory.get_field_for(
+            monster.owner, monster.terrain_type) is not field
 
     def get_path_to_tower(self, start):
         self.pathfactory = PathFactory(self.board)
         self.path = self.pathfactory.get_path_to_tower(start)
         assert self.path, 'Could not generate path'
+
+
+class TestLargeBoards(TestCase):
+    """Searches that explore more than a thousand tiles used to assert"""
+    SIZE = 64
+
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self):
+        towers = {(self.SIZE - 2, self.SIZE - 2)}
+        rows = [' '.join('t' if (x, y) in towers else '.'
+                         for x in range(self.SIZE)) for y in range(self.SIZE)]
+        layout = f'{self.SIZE} {self.SIZE}\n' + '\n'.join(rows)
+        legend = {'.': Terrain.GRASS, 't': Terrain.TOWER}
+        self.board = BoardTextBuilder().make_board_from_text(layout, legend)
+        self.start = (0, 0)
+        self.board.place_new_monster(Type.ROMAN, self.start)
+
+    def test_a_star_across_board(self, before):
+        destination = (self.SIZE - 1, self.SIZE - 1)
+        matrix = AStarMatrixFactory(self.board).generate_path_matrix(
+            self.start, destination)
+        assert destination in matrix
+
+    def test_tower_search_across_board(self, before):
+        path = PathFactory(self.board).get_path_to_tower(self.start)
+        assert path[-1] == (self.SIZE - 2, self.SIZE - 2)
+
+
+class TestMatrixCache(TestCase):
+    @pytest.fixture
+    def before(self):
+        self.make_board_from_layout(Boards.get_zigzag, (4, 4))
+        self.generator = PathMatrixFactory(self.board)
+        self.matrix = self.generator.generate_path_matrix(self.start_pos)
+
+    def test_unchanged_board_returns_cached_matrix(self, before):
+        assert self.generator.generate_path_matrix(self.start_pos) \
+            is self.matrix
+
+    def test_board_changes_invalidate_matrix(self, before):
+        version = self.board.version
+        self.board.set_terrain_to((0, 0), Terrain.VOLCANO)
+        assert self.board.version > version
+        assert self.generator.generate_path_matrix(self.start_pos) \
+            is not self.matrix
+
+    def test_data_table_reload_invalidates_matrix(self, before, monkeypatch):
+        monkeypatch.setattr(DataTables, 'version', DataTables.version + 1)
+        assert self.generator.generate_path_matrix(self.start_pos) \
+            is not self.matrix
+
+    def test_moved_monster_gets_new_matrix(self, before):
+        monster = self.board.monster_at(self.start_pos)
+        self.board.set_monster_pos(monster, (5, 5))
+        matrix = self.generator.generate_path_matrix((5, 5))
+        assert matrix is not self.matrix
+        assert matrix.start == (5, 5)
+
+    def test_other_monster_gets_own_matrix(self, before):
+        other_pos = (0, 0)
+        self.board.place_new_monster(MonsterType.CHIMERA, other_pos)
+        other_matrix = self.generator.generate_path_matrix(other_pos)
+        assert other_matrix.monster is self.board.monster_at(other_pos)
+        assert self.generator.generate_path_matrix(other_pos) is other_matrix
+
+    def test_far_away_change_keeps_matrix(self, before):
+        far_away = (16, 8)
+        assert far_away not in self.matrix.explored_tiles
+        self.board.place_new_monster(MonsterType.CHIMERA, far_away)
+        assert self.generator.generate_path_matrix(self.start_pos) \
+            is self.matrix
+
+    def test_nearby_change_discards_matrix(self, before):
+        self.board.place_new_monster(MonsterType.CHIMERA, (5, 4))
+        assert self.generator.generate_path_matrix(self.start_pos) \
+            is not self.matrix
+
+
+class TestMatrixCacheOnRandomBoard:
+    def test_cached_matrices_equal_new_matrices(self):
+        random.seed(5)
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'random'
+        mapoptions.set_number_of_players(2)
+        self.board = RandomBoardBuilder().load_map(40, 40, mapoptions)
+        self.generator = PathMatrixFactory(self.board)
+        self.monsters = []
+        for n in range(30):
+            self.place_random_monster(self.board.players[n % 2])
+        for _ in range(80):
+            self.make_random_change()
+            for monster in self.monsters:
+                self.compare_with_new_matrix(monster)
+
+    def place_random_monster(self, owner):
+        pos = self.get_random_empty_pos()
+        monster_type = random.randint(Type.FIRE, Type.TAITAN)
+        self.monsters.append(
+            self.board.place_new_monster(monster_type, pos, owner))
+
+    def get_random_empty_pos(self):
+        while True:
+            pos = (random.randrange(self.board.x_max),
+                   random.randrange(self.board.y_max))
+            if not self.board.monster_at(pos):
+                return pos
+
+    def make_random_change(self):
+        choice = random.randrange(3)
+        if choice == 0:
+            monster = random.choice(self.monsters)
+            self.board.set_monster_pos(monster, self.get_random_empty_pos())
+        elif choice == 1:
+            pos = (random.randrange(self.board.x_max),
+                   random.randrange(self.board.y_max))
+            self.board.set_terrain_to(pos, random.randrange(13))
+        else:
+            self.board.players.goto_next_player()
+
+    def compare_with_new_matrix(self, monster):
+        matrix = self.generator.generate_path_matrix(monster.pos)
+        new_matrix = PathMatrixFactory(self.board).generate_path_matrix(
+            monster.pos)
+        assert matrix.dist_values == new_matrix.dist_values
+        assert matrix.accessible_positions == new_matrix.accessible_positions
+        assert matrix.enemies == new_matrix.enemies
+
+
+class TestDestinationField(TestCase):
+    @pytest.fixture
+    def before(self):
+        random.seed(11)
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'random'
+        self.board = RandomBoardBuilder().load_map(20, 20, mapoptions)
+        self.player = self.board.get_current_player()
+
+    def test_paths_are_shortest_paths(self, before):
+        destination = (15, 4)
+        self.board.set_terrain_to(destination, Terrain.GRASS)
+        monster = self.board.place_new_monster(
+            Type.TROLL, (2, 17), self.player)
+        factory = DestinationFieldFactory(self.board)
+        field = factory.get_field_for(destination, monster.terrain_type)
+        assert factory.get_field_for(
+            destination, monster.terrain_type) is field
+        for pos in ((2, 17), (0, 0), (19, 19), (10, 10)):
+            self.board.set_monster_pos(monster, pos)
+            dist, _ = SimpleDijkstraGraph(self.board, monster).dijkstra(pos)
+            path = field.get_path_from(pos, monster.stats.move_points)
+            if dist[destination] == SimpleDijkstraGraph.INFINITY:
+                assert path is None
+                continue
+            assert field.get_distance_value_at(pos) == dist[destination]
+            self.assert_path_costs(path, dist[destination], monster)
+            cost_to_furthest = dist[destination] - \
+                field.get_distance_value_at(path.furthest_reachable)
+            assert cost_to_furthest <= monster.stats.move_points
+
+    def test_terrain_change_gives_new_field(self, before):
+        factory = DestinationFieldFactory(self.board)
+        field = factory.get_field_for((1, 1), 0)
+        self.board.set_terrain_to((5, 5), Terrain.VOLCANO)
+        assert factory.get_field_for((1, 1), 0) is not field
+
+    def test_data_table_reload_gives_new_field(self, before, monkeypatch):
+        factory = DestinationFieldFactory(self.board)
+        field = factory.get_field_for((1, 1), 0)
+        monkeypatch.setattr(DataTables, 'version', DataTables.version + 1)
+        assert factory.get_field_for((1, 1), 0) is not field
+
+    def assert_path_costs(self, path, expected_cost, monster):
+        cost = 0
+        for n in range(1, len(path)):
+            assert path[n] in self.board.get_posses_adjacent_to(path[n - 1])
+            cost += DataTables.get_terrain_cost(
+                self.board.terrain_at(path[n]), monster.terrain_type)
+        assert cost == expected_cost
+
+
+class TestSimplePathToLord(TestCase):
+    """Paths to a lord come from a destination field, other paths from A*"""
+
+    @pytest.mark.parametrize('get_board', (
+            Boards.get_square, Boards.get_zigzag, Boards.get_cross))
+    def test_field_moves_as_far_as_a_star(self, get_board):
+        """Paths may differ on ties, but with one move cost on every tile
+        the furthest reachable pos is always equally far from the lord"""
+        self.board = get_board()
+        player, enemy = self.board.players[0], self.board.players[1]
+        lord_pos = (self.board.x_max - 1, self.board.y_max - 1)
+        self.board.place_new_monster(Type.DAIMYOU, lord_pos, enemy)
+        monster = self.board.place_new_monster(Type.TROLL, (0, 0), player)
+        field_paths = PathFactory(
+            self.board, DestinationFieldFactory(self.board))
+        for pos in itertools.product(range(self.board.x_max),
+                                     range(self.board.y_max)):
+            if (self.board.monster_at(pos)
+                    or self.board.terrain_at(pos) == Terrain.VOLCANO):
+                continue
+            self.board.set_monster_pos(monster, pos)
+            a_star_path = PathFactory(self.board).get_simple_path_between(
+                pos, lord_pos)
+            field_path = field_paths.get_simple_path_between(pos, lord_pos)
+            field = field_paths.destination_field_factory.get_field_for(
+                lord_pos, monster.terrain_type)
+            assert (field.get_distance_value_at(field_path.furthest_reachable)
+                    == field.get_distance_value_at(
+                        a_star_path.furthest_reachable)), pos
+
+    def test_other_destinations_use_a_star(self):
+        self.board = Boards.get_square()
+        self.board.place_new_monster(Type.TROLL, (0, 0))
+        factory = DestinationFieldFactory(self.board)
+        PathFactory(self.board, factory).get_simple_path_between(
+            (0, 0), (8, 8))
+        assert not factory.fields
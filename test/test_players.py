@@ -50,6 +50,13 @@ class TestPlayers:
         assert player.mana_gain == self.mana_gains[1]
         self.check_if_next_player_is(2)
 
+    def test_current_player_stays_after_removal_of_earlier(self, before):
+        self.playerlist.goto_next_player()
+        self.playerlist.goto_next_player()
+        self.playerlist.remove_player(self.player_0)
+        assert self.playerlist.get_current_player() is self.player_2
+        self.check_if_next_player_is(1)
+
     def test_get_current_player(self, before):
         player = self.playerlist.get_current_player()
         assert player.mana_gain == self.mana_gains[0]
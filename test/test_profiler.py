@@ -0,0 +1,79 @@
+import csv
+import json
+import random
+
+import pytest
+
+from src.components.board.brain import MonsterBrain
+from src.components.board.pathing import PathMatrixFactory
+from src.components.combat.attack import AttackTable
+from src.handlers.simulation_handler import SimulationHandler
+from src.helper.Misc.constants import MonsterType
+from src.helper.profiler import Profiler
+from src.model.board_model import BoardModel
+from test.test_simulation import TestSimulation
+
+
+class TestProfiler:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self):
+        random.seed(0)
+        self.mapoptions = TestSimulation.make_mapoptions()
+        self.mapoptions.seed = 3
+
+    def test_records_per_turn(self, before):
+        with Profiler() as profiler:
+            result = SimulationHandler(self.mapoptions, max_turns=6).run()
+        assert result.turns == 6
+        # the idle player 1 has nothing to record on its turns
+        turns = {(turn, player) for turn, player, _, _, _
+                 in profiler.get_rows()}
+        assert turns == {(2, 0), (4, 0)}
+        totals = profiler.get_totals()
+        calls, seconds = totals['MonsterBrain.do_action']
+        assert calls > 0 and seconds > 0
+        assert totals['PathMatrixFactory.generate_path_matrix'][0] > 0
+
+    def test_disabled_leaves_methods_alone(self, before):
+        do_action = MonsterBrain.__dict__['do_action']
+        generate = PathMatrixFactory.__dict__['generate_path_matrix']
+        with Profiler():
+            assert MonsterBrain.__dict__['do_action'] is not do_action
+        assert MonsterBrain.__dict__['do_action'] is do_action
+        assert PathMatrixFactory.__dict__['generate_path_matrix'] is generate
+
+    def test_records_ai_attack_scoring(self, before):
+        model = BoardModel(self.mapoptions)
+        monsters = (
+            model.board.place_new_monster(MonsterType.TROLL, (0, 0)),
+            model.board.place_new_monster(MonsterType.ROMAN, (0, 1)))
+        expected = model.get_combat_outcome_between(*monsters, 0)
+        get_for_monsters = AttackTable.__dict__['get_for_monsters']
+        with Profiler() as profiler:
+            outcome = model.get_combat_outcome_between(*monsters, 0)
+        assert AttackTable.__dict__['get_for_monsters'] is get_for_monsters
+        assert outcome.hp_chances == expected.hp_chances
+        totals = profiler.get_totals()
+        assert totals['AttackTable.get_for_monsters'][0] == 1
+        assert totals['CombatOutcomeCalculator.get_outcome_from_table'][0] \
+            == 1
+
+    def test_only_one_enabled(self, before):
+        with Profiler():
+            with pytest.raises(AssertionError):
+                Profiler().enable()
+
+    def test_writes_json_and_csv(self, before, tmp_path):
+        with Profiler() as profiler:
+            SimulationHandler(self.mapoptions, max_turns=4).run()
+        profiler.write(str(tmp_path / 'profile.json'))
+        profiler.write(str(tmp_path / 'profile.csv'))
+        with open(tmp_path / 'profile.json') as fd:
+            records = json.load(fd)
+        with open(tmp_path / 'profile.csv') as fd:
+            rows = list(csv.DictReader(fd))
+        assert len(records) == len(rows) == len(profiler.get_rows())
+        assert set(records[0]) == {'turn', 'player', 'hook', 'calls',
+                                   'seconds'}
+        assert int(rows[0]['calls']) == records[0]['calls']
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from src.components.board.board import MapOptions
+from src.handlers.simulation_handler import SimulationHandler
+from src.helper.Misc.constants import AiType
+
+
+class TestSimulation:
+    @pytest.fixture
+    def before(self):
+        random.seed(0)
+        self.mapoptions = self.make_mapoptions()
+
+    @staticmethod
+    def make_mapoptions():
+        mapoptions = MapOptions()
+        mapoptions.mapname = 'test'
+        mapoptions.set_number_of_players(2)
+        mapoptions.ai_types = {0: AiType.default, 1: AiType.idle}
+        return mapoptions
+
+    def test_default_ai_beats_idle_ai(self, before):
+        result = SimulationHandler(self.mapoptions).run()
+        assert result.is_finished()
+        assert result.winners == (0,)
+        assert 0 < result.turns < SimulationHandler.MAX_TURNS
+        assert result.wall_time > 0
+
+    def test_stops_after_max_turns(self, before):
+        simulation = SimulationHandler(self.mapoptions, max_turns=4)
+        result = simulation.run()
+        assert not result.is_finished()
+        assert result.winners == ()
+        assert result.turns == 4
+        assert len(simulation.model.players) == 2
+
+    def test_human_players_are_played_by_ai(self, before):
+        self.mapoptions.ai_types = {0: AiType.human, 1: AiType.idle}
+        simulation = SimulationHandler(self.mapoptions)
+        assert simulation.model.ai_only_match
+        assert simulation.run().winners == (0,)
+
+    def test_same_seed_plays_same_game(self, before):
+        self.mapoptions.seed = 3
+        result = SimulationHandler(self.mapoptions).run()
+        assert result.seed == 3
+        random.seed(1)
+        mapoptions = self.make_mapoptions()
+        mapoptions.seed = 3
+        replay = SimulationHandler(mapoptions).run()
+        assert (replay.turns, replay.winners) == (result.turns, result.winners)
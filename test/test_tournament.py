@@ -0,0 +1,55 @@
+import pytest
+
+from src.components.combat.combatlogbuilder import CombatLogBuilder
+from src.handlers.tournament_handler import TournamentHandler, \
+    get_match_setups, play_match, TournamentResults
+from src.helper.Misc.constants import AiType, MonsterType
+
+
+class TestTournament:
+    # noinspection PyAttributeOutsideInit
+    @pytest.fixture
+    def before(self, monkeypatch):
+        # other test modules turn this on for every test that follows, the
+        # workers are forked with whatever it is, so set it for them
+        monkeypatch.setattr(CombatLogBuilder, 'perfect_accuracy', False)
+        self.setups = get_match_setups(
+            range(1, 3),
+            lord_lineups=((MonsterType.DAIMYOU, MonsterType.WIZARD),
+                          (MonsterType.WIZARD, MonsterType.DAIMYOU)),
+            ai_lineups=((AiType.default, AiType.idle),))
+        self.results = TournamentHandler(self.setups, processes=2).run()
+
+    def test_every_setup_is_played_in_order(self, before):
+        assert len(self.results.match_results) == 4
+        for setup, match_result in zip(self.setups,
+                                       self.results.match_results):
+            assert match_result.setup.seed == setup.seed
+            assert match_result.setup.lord_types == setup.lord_types
+            assert match_result.result.wall_time > 0
+
+    def test_matches_can_be_replayed(self, before):
+        for match_result in self.results.match_results:
+            replay = play_match(match_result.setup)
+            assert replay.result.turns == match_result.result.turns
+            assert replay.result.winners == match_result.result.winners
+
+    def test_win_rates(self, before):
+        assert self.results.get_finished_count() == 4
+        assert self.results.get_win_rates_per_ai_type() == {
+            AiType.default: 1, AiType.idle: 0}
+        assert self.results.get_win_rates_per_lord() == {
+            MonsterType.DAIMYOU: 0.5, MonsterType.WIZARD: 0.5}
+        assert 'win rate per lord' in self.results.report()
+
+
+class TestTournamentSetup:
+    def test_human_players_are_recorded_as_default_ai(self):
+        setups = get_match_setups(
+            range(1), ai_lineups=((AiType.human, AiType.idle),),
+            lord_lineups=((MonsterType.DAIMYOU, MonsterType.WIZARD),))
+        assert setups[0].ai_types == (AiType.default, AiType.idle)
+
+    def test_report_without_matches(self):
+        assert TournamentResults([], 0.0).report() == \
+            '0 matches in 0.0s, 0 finished'